@@ -8,20 +8,30 @@ au fur et à mesure les autres types de déploiement, en commencant par "high-av
 """
 
 import os
-import sys
+import re
 import json
 import shutil
+import time
 import argparse
 from datetime import datetime
+from functools import lru_cache
 
 from terraform_templates import TERRAFORM_TEMPLATES
 from variables_templates import VARIABLE_TEMPLATES
 from deployment_templates import DEPLOYMENT_TEMPLATES
 # from user_data_template import USER_DATA_TEMPLATE
-from env_parser import parse_env_file
+from env_parser import parse_env_file, ConfigurationError
+from profiler import GenerationStats
+from db_tuning import tuning_placeholders, check_shared_state
 
 ENV_FILE_DEFAULT = '.env'
 DEFAULT_OUTPUT_DIR = 'terraform-output'
+PLACEHOLDER_PATTERN = re.compile(r"\{([a-z0-9_]+)\}")
+
+# Issues de generate_deployment
+GENERATED = "generated"
+DECLINED = "declined"   # l'utilisateur a refusé d'écraser le répertoire de sortie
+REFUSED = "refused"     # configuration .env invalide pour ce type de déploiement
 
 def clear_screen():
     """Clear the terminal screen."""
@@ -40,7 +50,7 @@ def create_directory(dir_name):
     os.makedirs(dir_name)
     return True
 
-def format_env_vars_for_terraform(env_vars):
+def format_env_vars_for_terraform(env_vars, deployment_type):
     """Format environment variables for use in Terraform templates."""
     current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -51,10 +61,38 @@ def format_env_vars_for_terraform(env_vars):
             formatted_vars[key] = json.dumps(value)
     
     formatted_vars["date"] = current_date
+    formatted_vars.update(tuning_placeholders(env_vars, deployment_type))
     
     return formatted_vars
 
-def generate_main_tf(deployment_type, env_vars_formatted):
+@lru_cache(maxsize=None)
+def compile_template(template):
+    """Split a template once into its literal chunks and {placeholder} names."""
+    parts = PLACEHOLDER_PATTERN.split(template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+def precompile_templates():
+    """Compile every component and variable template ahead of the first render."""
+    templates = list(VARIABLE_TEMPLATES.values()) + list(TERRAFORM_TEMPLATES["outputs"].values())
+    templates += [template for name, template in TERRAFORM_TEMPLATES.items() if name != "outputs"]
+    for template in templates:
+        compile_template(template)
+
+def render_template(template, env_vars_formatted):
+    """Replace {placeholder} markers in a template and count the substitutions."""
+    literals, names = compile_template(template)
+    parts = [literals[0]]
+    substitutions = 0
+    for name, literal in zip(names, literals[1:]):
+        if name in env_vars_formatted:
+            parts.append(str(env_vars_formatted[name]))
+            substitutions += 1
+        else:
+            parts.append("{" + name + "}")
+        parts.append(literal)
+    return "".join(parts), substitutions
+
+def generate_main_tf(deployment_type, env_vars_formatted, stats):
     """Generate main.tf content by assembling components."""
     if deployment_type not in DEPLOYMENT_TEMPLATES:
         print(f"Error: Unknown deployment type '{deployment_type}'")
@@ -68,14 +106,11 @@ def generate_main_tf(deployment_type, env_vars_formatted):
     content += f"# This file was assembled from modular components\n\n"
     
     for component in components:
-        print(f"current component: {component}")
         if component in TERRAFORM_TEMPLATES:
             try:
-                component_content = TERRAFORM_TEMPLATES[component]
-                
-                for key, value in env_vars_formatted.items():
-                    placeholder = "{" + key + "}"
-                    component_content = component_content.replace(placeholder, str(value))
+                start = time.perf_counter()
+                component_content, substitutions = render_template(TERRAFORM_TEMPLATES[component], env_vars_formatted)
+                stats.record_component("main", component, time.perf_counter() - start, component_content, substitutions)
                 
                 content += component_content + "\n\n"
             except Exception as e:
@@ -86,17 +121,16 @@ def generate_main_tf(deployment_type, env_vars_formatted):
     for output in deployment_config.get("outputs", []):
         if output in TERRAFORM_TEMPLATES.get("outputs", {}):
             try:
-                output_content = TERRAFORM_TEMPLATES["outputs"][output]
-                for key, value in env_vars_formatted.items():
-                    placeholder = "{" + key + "}"
-                    output_content = output_content.replace(placeholder, str(value))
+                start = time.perf_counter()
+                output_content, substitutions = render_template(TERRAFORM_TEMPLATES["outputs"][output], env_vars_formatted)
+                stats.record_component("output", output, time.perf_counter() - start, output_content, substitutions)
                 content += output_content + "\n"
             except Exception as e:
                 print(f"Warning: Error processing output {output}: {e}")
     
     return content
 
-def generate_variables_tf(deployment_type, env_vars_formatted):
+def generate_variables_tf(deployment_type, env_vars_formatted, stats):
     """Generate variables.tf content by assembling sections."""
     if deployment_type not in DEPLOYMENT_TEMPLATES:
         print(f"Error: Unknown deployment type '{deployment_type}'")
@@ -111,11 +145,9 @@ def generate_variables_tf(deployment_type, env_vars_formatted):
     for section in variable_sections:
         if section in VARIABLE_TEMPLATES:
             try:
-                section_content = VARIABLE_TEMPLATES[section]
-                
-                for key, value in env_vars_formatted.items():
-                    placeholder = "{" + key + "}"
-                    section_content = section_content.replace(placeholder, str(value))
+                start = time.perf_counter()
+                section_content, substitutions = render_template(VARIABLE_TEMPLATES[section], env_vars_formatted)
+                stats.record_component("variables", section, time.perf_counter() - start, section_content, substitutions)
                 
                 content += section_content + "\n\n"
             except Exception as e:
@@ -164,39 +196,78 @@ def generate_terraform_tfvars(deployment_type, env_vars_formatted):
     content += f'wordpress_admin_password = "{env_vars_formatted["wordpress_admin_password"]}"\n'
     content += f'wordpress_admin_email = "{env_vars_formatted["wordpress_admin_email"]}"\n'
     
+    content += "\n# Monitoring Configuration\n"
+    content += f'enable_monitoring  = {env_vars_formatted["enable_monitoring"]}\n'
+    if env_vars_formatted["alarm_email"]:
+        content += f'alarm_email        = "{env_vars_formatted["alarm_email"]}"\n'
+    content += f'log_retention_days = {env_vars_formatted["log_retention_days"]}\n'
+    if deployment_type == "high-availability":
+        content += f'alarm_latency_p95_ms = {env_vars_formatted["alarm_latency_p95_ms"]}\n'
+        content += f'alarm_latency_p99_ms = {env_vars_formatted["alarm_latency_p99_ms"]}\n'
+        content += f'alarm_5xx_count    = {env_vars_formatted["alarm_5xx_count"]}\n'
+    
+    content += "\n# Web Performance Configuration\n"
+    content += f'enable_web_performance = {env_vars_formatted["enable_web_performance"]}\n'
+    content += f'static_asset_max_age_days = {env_vars_formatted["static_asset_max_age_days"]}\n'
+    
+    content += "\n# Shared Uploads (EFS) Configuration\n"
+    content += f'enable_efs         = {env_vars_formatted["enable_efs"]}\n'
+    content += f'efs_throughput_mode = "{env_vars_formatted["efs_throughput_mode"]}"\n'
+    if env_vars_formatted["efs_throughput_mode"] == "provisioned":
+        content += f'efs_provisioned_throughput_mibps = {env_vars_formatted["efs_provisioned_throughput_mibps"]}\n'
+    content += f'efs_attribute_cache_seconds = {env_vars_formatted["efs_attribute_cache_seconds"]}\n'
+    
     if deployment_type == "high-availability":
         content += "\n# High Availability Configuration\n"
-        content += f'use_rds            = "{env_vars_formatted["use_rds"]}"\n'
+        content += f'availability_zone_count = {env_vars_formatted["availability_zone_count"]}\n'
+        content += f'use_rds            = {env_vars_formatted["use_rds"]}\n'
         content += f'rds_instance_class = "{env_vars_formatted["rds_instance_class"]}"\n'
         content += f'rds_storage_size   = {env_vars_formatted["rds_storage_size"]}\n'
-        content += f'rds_multi_az       = "{env_vars_formatted["rds_multi_az"]}"\n'
+        content += f'rds_multi_az       = {env_vars_formatted["rds_multi_az"]}\n'
         content += f'enable_auto_scaling = "{env_vars_formatted["enable_auto_scaling"]}"\n'
         content += f'min_instances      = {env_vars_formatted["min_instances"]}\n'
         content += f'max_instances      = {env_vars_formatted["max_instances"]}\n'
         content += f'scale_up_cpu_threshold = {env_vars_formatted["scale_up_cpu_threshold"]}\n'
         content += f'scale_down_cpu_threshold = {env_vars_formatted["scale_down_cpu_threshold"]}\n'
+        content += f'scale_requests_per_target = {env_vars_formatted["scale_requests_per_target"]}\n'
+        content += f'enable_warm_pool   = {env_vars_formatted["enable_warm_pool"]}\n'
+        content += f'warm_pool_min_size = {env_vars_formatted["warm_pool_min_size"]}\n'
+        content += f'warm_pool_max_prepared_capacity = {env_vars_formatted["warm_pool_max_prepared_capacity"]}\n'
+        content += f'scaling_schedules  = {env_vars_formatted["scaling_schedules"]}\n'
+        content += f'scaling_schedule_time_zone = "{env_vars_formatted["scaling_schedule_time_zone"]}"\n'
+        content += f'enable_predictive_scaling = {env_vars_formatted["enable_predictive_scaling"]}\n'
+        content += f'predictive_scaling_mode = "{env_vars_formatted["predictive_scaling_mode"]}"\n'
+        content += f'predictive_scaling_buffer_seconds = {env_vars_formatted["predictive_scaling_buffer_seconds"]}\n'
+        content += f'predictive_scaling_cpu_target = {env_vars_formatted["predictive_scaling_cpu_target"]}\n'
     
     return content
 
-def assemble_terraform_configs(deployment_type, env_vars):
-
-    env_vars_formatted = format_env_vars_for_terraform(env_vars)
+def assemble_terraform_configs(deployment_type, env_vars, stats):
+    """Render main.tf, variables.tf and terraform.tfvars for a deployment type."""
+    env_vars_formatted = format_env_vars_for_terraform(env_vars, deployment_type)
+    
+    renderers = {
+        "main.tf": lambda: generate_main_tf(deployment_type, env_vars_formatted, stats),
+        "variables.tf": lambda: generate_variables_tf(deployment_type, env_vars_formatted, stats),
+        "terraform.tfvars": lambda: generate_terraform_tfvars(deployment_type, env_vars_formatted),
+    }
     
-    main_tf = generate_main_tf(deployment_type, env_vars_formatted)
-    variables_tf = generate_variables_tf(deployment_type, env_vars_formatted)
-    terraform_tfvars = generate_terraform_tfvars(deployment_type, env_vars_formatted)
+    configs = {}
+    for filename, render in renderers.items():
+        start = time.perf_counter()
+        configs[filename] = render()
+        stats.record_file(filename, time.perf_counter() - start, configs[filename])
     
-    return {
-        "main.tf": main_tf,
-        "variables.tf": variables_tf,
-        "terraform.tfvars": terraform_tfvars
-    }
+    return configs
 
-def write_terraform_files(configs, directory):
+def write_terraform_files(configs, directory, stats):
+    """Write the rendered configuration files to the output directory."""
     for filename, content in configs.items():
         file_path = os.path.join(directory, filename)
+        start = time.perf_counter()
         with open(file_path, 'w') as f:
             f.write(content)
+        stats.record_write(file_path, time.perf_counter() - start, len(content.encode("utf-8")))
         print(f"Created: {file_path}")
     return True
 
@@ -228,18 +299,24 @@ def write_env_file(env_vars, directory):
     print(f"Created: {env_file_path}")
     return True
 
-def generate_deployment(deployment_type, env_vars, directory=None):
-    """Generate Terraform files for the specified deployment type."""
+def generate_deployment(deployment_type, env_vars, directory, stats):
+    """Generate Terraform files for the specified deployment type; returns GENERATED, DECLINED or REFUSED."""
+    try:
+        check_shared_state(deployment_type, env_vars)
+    except ConfigurationError as e:
+        print(f"Error: {e}")
+        return REFUSED
+    
     if not directory:
         directory = f"terraform-{deployment_type}"
         directory = input(f"Enter directory name for the Terraform files [{directory}]: ") or directory
     
     if not create_directory(directory):
-        return False
+        return DECLINED
     
-    configs = assemble_terraform_configs(deployment_type, env_vars)
+    configs = assemble_terraform_configs(deployment_type, env_vars, stats)
     
-    success = write_terraform_files(configs, directory)
+    success = write_terraform_files(configs, directory, stats)
     
     # Write a copy of the .env file
     # if success:
@@ -252,7 +329,7 @@ def generate_deployment(deployment_type, env_vars, directory=None):
         print(f"2. Run 'terraform init'")
         print(f"3. Run 'terraform apply'")
     
-    return success
+    return GENERATED
 
 def display_menu():
     """Display the main menu."""
@@ -304,7 +381,7 @@ def show_env_vars_summary(env_vars):
     print("=" * 60)
     print()
 
-def interactive_mode(env_vars):
+def interactive_mode(env_vars, stats):
     """Run the script in interactive mode with a menu."""
     while True:
         deployment_options = display_menu()
@@ -313,10 +390,10 @@ def interactive_mode(env_vars):
         
         if choice == 0:
             print("\nExiting. Goodbye!")
-            sys.exit(0)
+            return
         elif choice in deployment_options:
             deployment_type = deployment_options[choice]
-            generate_deployment(deployment_type, env_vars)
+            generate_deployment(deployment_type, env_vars, None, stats)
             input("\nPress Enter to return to the main menu...")
         else:
             print("Invalid choice. Please try again.")
@@ -328,6 +405,8 @@ def parse_command_line_args():
     parser.add_argument('--type', '-t', choices=list(DEPLOYMENT_TEMPLATES.keys()), help='Deployment type')
     parser.add_argument('--output', '-o', help='Output directory')
     parser.add_argument('--interactive', '-i', action='store_true', help='Run in interactive mode (default if no type is specified)')
+    parser.add_argument('--profile', action='store_true', help='Print a per-component timing report on stderr')
+    parser.add_argument('--stats-json', metavar='PATH', help='Write generator timing and size metrics to a JSON file')
     return parser.parse_args()
 
 # def generate_user_data(env_vars):
@@ -360,12 +439,22 @@ def main():
     args = parse_command_line_args()
     env_vars = parse_env_file(args.env)
 
+    stats = GenerationStats(enabled=args.profile or bool(args.stats_json))
+
     # generate_user_data(env_vars)
     
-    if args.type and not args.interactive:
-        generate_deployment(args.type, env_vars, args.output)
-    else:
-        interactive_mode(env_vars)
+    try:
+        if args.type and not args.interactive:
+            if generate_deployment(args.type, env_vars, args.output, stats) == REFUSED:
+                raise SystemExit(1)
+        else:
+            interactive_mode(env_vars, stats)
+    finally:
+        # Rapport émis même après un refus, une annulation ou une erreur
+        if args.profile:
+            stats.print_report()
+        if args.stats_json:
+            stats.write_json(args.stats_json)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+# db_tuning.py
+"""
+Dimensionnement de MariaDB et PHP-FPM à partir du type d'instance.
+En mode cost-efficient, MariaDB et Apache/PHP partagent la même instance: la
+mémoire est répartie entre le système, la base et les workers PHP pour éviter
+que l'instance ne swappe sous la charge.
+"""
+
+from deployment_templates import rendered_components
+from env_parser import ConfigurationError
+from pricing_tables import EC2_INSTANCE_TYPES
+
+# Répartition de la mémoire (Mio) par taille d'instance, base de données locale
+INSTANCE_MEMORY_BUDGETS = {
+    1024:  {"system_mib": 256,  "database_mib": 256,  "php_mib": 512},
+    2048:  {"system_mib": 384,  "database_mib": 640,  "php_mib": 1024},
+    4096:  {"system_mib": 512,  "database_mib": 1408, "php_mib": 2176},
+    8192:  {"system_mib": 768,  "database_mib": 3072, "php_mib": 4352},
+    16384: {"system_mib": 1024, "database_mib": 6144, "php_mib": 9216},
+}
+
+DEFAULT_MEMORY_MIB = 1024
+
+# Mémoire moyenne d'un worker PHP-FPM servant WordPress
+PHP_WORKER_MIB = 64
+
+# Connexions gardées pour wp-cron, WP-CLI et l'administration
+EXTRA_DB_CONNECTIONS = 20
+
+# Types d'instance inconnus déjà signalés (un avertissement par type)
+_warned_instance_types = set()
+
+
+def memory_budget(instance_type, local_database=True):
+    """Return the system/database/PHP memory split (MiB) for an instance type."""
+    memory_mib = EC2_INSTANCE_TYPES.get(instance_type, {}).get("memory_mib", DEFAULT_MEMORY_MIB)
+    size = max([size for size in INSTANCE_MEMORY_BUDGETS if size <= memory_mib] or [DEFAULT_MEMORY_MIB])
+    budget = dict(INSTANCE_MEMORY_BUDGETS[size])
+
+    if not local_database:
+        budget["php_mib"] += budget["database_mib"]
+        budget["database_mib"] = 0
+
+    return budget
+
+def compute_tuning_profile(instance_type, local_database=True):
+    """Compute MariaDB and PHP-FPM settings for an instance type."""
+    budget = memory_budget(instance_type, local_database)
+    database_mib = budget["database_mib"]
+
+    max_children = max(2, budget["php_mib"] // PHP_WORKER_MIB)
+    buffer_pool_mb = max(64, int(database_mib * 0.6))
+
+    return {
+        "db_innodb_buffer_pool_mb": buffer_pool_mb,
+        "db_innodb_log_file_mb": min(512, max(32, buffer_pool_mb // 4)),
+        "db_max_connections": max_children + EXTRA_DB_CONNECTIONS,
+        "db_tmp_table_mb": min(64, max(16, database_mib // 32)),
+        "db_performance_schema": "ON" if database_mib >= 2048 else "OFF",
+        "php_fpm_max_children": max_children,
+        "php_fpm_start_servers": max(1, max_children // 4),
+        "php_fpm_min_spare_servers": max(1, max_children // 4),
+        "php_fpm_max_spare_servers": max(2, max_children // 2),
+    }
+
+def uses_local_database(deployment_type, env_vars):
+    """Return True unless USE_RDS is set and the deployment actually renders an RDS instance."""
+    return not (env_vars.get("use_rds") == "true" and "rds_instance" in rendered_components(deployment_type))
+
+def check_shared_state(deployment_type, env_vars):
+    """Raise ConfigurationError when the database or uploads sharing does not match the instance count."""
+    components = rendered_components(deployment_type)
+    multi_instance = "auto_scaling_group" in components and not uses_local_database(deployment_type, env_vars)
+
+    # EFS only shares uploads between instances: a single instance keeps them on its own volume
+    if env_vars["enable_efs"] == "true" and not multi_instance:
+        raise ConfigurationError(
+            f'ENABLE_EFS shares uploads between instances, which {deployment_type} cannot run without '
+            'a shared database: use high-availability with USE_RDS="true", or set ENABLE_EFS="false"')
+
+    if "auto_scaling_group" not in components or multi_instance:
+        return
+
+    scheduled_max = [schedule["max_size"] for schedule in env_vars["scaling_schedules"]]
+    max_instances = max([int(env_vars["max_instances"])] + scheduled_max)
+    if max_instances > 1:
+        raise ConfigurationError(
+            f"{deployment_type} would run up to {max_instances} instances, each with its own MariaDB "
+            'database: set USE_RDS="true" for a shared RDS database, or MAX_INSTANCES=1 (and schedules to max 1)')
+
+def tuning_placeholders(env_vars, deployment_type):
+    """Return the tuning values used as {placeholders} in the Terraform templates."""
+    instance_type = env_vars["instance_type"]
+    if instance_type not in EC2_INSTANCE_TYPES and instance_type not in _warned_instance_types:
+        _warned_instance_types.add(instance_type)
+        print(f"Warning: Unknown instance type '{instance_type}', sizing MariaDB and PHP-FPM for {DEFAULT_MEMORY_MIB} MiB")
+
+    return compute_tuning_profile(instance_type, uses_local_database(deployment_type, env_vars))
@@ -4,27 +4,33 @@ Définition des templates de déploiement qui spécifient quels composants
 inclure pour chaque type de déploiement.
 """
 
+from terraform_templates import TERRAFORM_TEMPLATES
+
 DEPLOYMENT_TEMPLATES = {
     "cost-efficient": {
         "description": "Configuration économique avec une seule instance EC2 et un load balancer",
         "components": [
             "provider",
             "vpc",
-            "internet_gateway",
             "public_subnet",
-            "route_table",
             "security_group_instance",
             "security_group_lb",
+            "instance_role",
+            "efs",
             "ec2_instance",
+            "monitoring",
+            "monitoring_instance_alarms",
         ],
         "variable_sections": [
             "aws", 
             "vpc", 
             "ec2", 
-            "wordpress"
+            "wordpress",
+            "monitoring",
+            "web_performance",
+            "efs"
         ],
         "outputs": [
-            "load_balancer_dns",
             "instance_ip"
         ]
     },
@@ -33,17 +39,20 @@ DEPLOYMENT_TEMPLATES = {
         "components": [
             "provider",
             "vpc",
-            "internet_gateway",
             "subnet_multi_az",
-            "route_table",
             "security_group_instance",
             "security_group_lb",
             "security_group_rds",
             "rds_instance",
+            "instance_role",
+            "efs",
             "auto_scaling_group",
             "launch_template",
             "load_balancer",
-            "target_group"
+            "target_group",
+            "predictive_scaling",
+            "monitoring",
+            "monitoring_alb"
         ],
         "variable_sections": [
             "aws", 
@@ -51,11 +60,20 @@ DEPLOYMENT_TEMPLATES = {
             "ec2", 
             "rds",
             "auto_scaling",
-            "wordpress"
+            "predictive_scaling",
+            "wordpress",
+            "monitoring",
+            "web_performance",
+            "efs"
         ],
         "outputs": [
             "load_balancer_dns",
             "rds_endpoint"
         ]
     }
-}
\ No newline at end of file
+}
+
+def rendered_components(deployment_type):
+    """Return the components of a deployment type that have a Terraform template (the others are skipped)."""
+    components = DEPLOYMENT_TEMPLATES.get(deployment_type, {}).get("components", [])
+    return [component for component in components if component in TERRAFORM_TEMPLATES]
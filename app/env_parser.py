@@ -1,9 +1,95 @@
 import os
 from dotenv import load_dotenv
 
-def parse_env_file(env_file_path):
+NEED_VALUES_KEYS = ["EC2_AMI_ID", "WORDPRESS_ADMIN_PASSWORD", "WORDPRESS_DB_PASSWORD"]
+BOOL_KEYS = ["USE_RDS", "RDS_MULTI_AZ", "ENABLE_AUTO_SCALING", "ENABLE_S3_MEDIA", "ENABLE_CLOUDFRONT", "ENABLE_MONITORING", "ENABLE_WEB_PERFORMANCE", "ENABLE_EFS",
+             "ENABLE_WARM_POOL", "ENABLE_PREDICTIVE_SCALING"]
+INT_KEYS = ["RDS_STORAGE_SIZE", "MIN_INSTANCES", "MAX_INSTANCES", "SCALE_UP_CPU_THRESHOLD", "SCALE_DOWN_CPU_THRESHOLD", "INSTANCE_VOLUME_SIZE",
+            "LOG_RETENTION_DAYS", "ALARM_LATENCY_P95_MS", "ALARM_LATENCY_P99_MS", "ALARM_5XX_COUNT", "ALARM_MEMORY_USED_PERCENT", "ALARM_DISK_USED_PERCENT",
+            "STATIC_ASSET_MAX_AGE_DAYS", "AVAILABILITY_ZONE_COUNT", "EFS_PROVISIONED_THROUGHPUT_MIBPS", "EFS_ATTRIBUTE_CACHE_SECONDS",
+            "EFS_STORAGE_ESTIMATE_GB", "WARM_POOL_MIN_SIZE", "WARM_POOL_MAX_PREPARED_CAPACITY", "PREDICTIVE_SCALING_BUFFER_SECONDS",
+            "PREDICTIVE_SCALING_CPU_TARGET", "SCALE_REQUESTS_PER_TARGET"]
+
+class ConfigurationError(Exception):
+    """Invalid .env value or combination of settings (a user error, not a generator bug)."""
+
+
+def read_env_file(env_file_path):
+    """Read the .env file and return its (KEY, value) pairs in order."""
+    env_values = []
+    
+    if os.path.exists(env_file_path):
+        print(f"Reading configuration from {env_file_path}...")
+        with open(env_file_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    try:
+                        key, value = line.split('=', 1)
+                    except ValueError:
+                        continue
+                    env_values.append((key.strip(), value.strip()))
+    
+    return env_values
+
+def set_env_value(env_vars, key, value):
+    """Store a single .env entry in env_vars, converting it to the expected type."""
+    key = key.strip().upper()
+    
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, list):
+        env_vars[key.lower()] = value
+        return
+    else:
+        value = str(value).strip()
+    
+    if value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+    elif value.startswith("'") and value.endswith("'"):
+        value = value[1:-1]
+    
+    if key in NEED_VALUES_KEYS and value:
+        env_vars[key.lower()] = value
+    elif key in BOOL_KEYS:
+        env_vars[key.lower()] = value.lower()
+    elif key in INT_KEYS:
+        try:
+            env_vars[key.lower()] = int(value)
+        except ValueError:
+            pass
+    else:
+        env_vars[key.lower()] = value
+
+def parse_scaling_schedules(value):
+    """Parse SCALING_SCHEDULES ("name|cron|min|max|desired;...") into scheduled actions."""
+    schedules = []
+    
+    for entry in value.split(';'):
+        if not entry.strip():
+            continue
+        fields = [field.strip() for field in entry.split('|')]
+        try:
+            name, recurrence, min_size, max_size, desired_capacity = fields
+            schedules.append({
+                "name": name,
+                "recurrence": recurrence,
+                "min_size": int(min_size),
+                "max_size": int(max_size),
+                "desired_capacity": int(desired_capacity),
+            })
+        except ValueError:
+            print(f"Warning: Ignoring invalid scaling schedule '{entry.strip()}' (expected name|cron|min|max|desired)")
+    
+    return schedules
+
+def parse_env_file(env_file_path, overrides=None):
     """Parse the .env file and return a dictionary of variables."""
-    env_vars = {}
+    return build_env_vars(read_env_file(env_file_path), overrides)
+
+def build_env_vars(env_values, overrides=None):
+    """Build the variables dictionary from defaults, .env pairs and optional overrides."""
+    env_values = list(env_values) + list((overrides or {}).items())
     
     # Set default values
     env_vars = {
@@ -50,43 +136,39 @@ def parse_env_file(env_file_path):
         "max_instances": 3,
         "scale_up_cpu_threshold": 80,
         "scale_down_cpu_threshold": 30,
+        "scale_requests_per_target": 1000,
+        "enable_warm_pool": "false",
+        "warm_pool_min_size": 1,
+        "warm_pool_max_prepared_capacity": 0,
+        "scaling_schedules": [],
+        "scaling_schedule_time_zone": "UTC",
+        "enable_predictive_scaling": "false",
+        "predictive_scaling_mode": "ForecastAndScale",
+        "predictive_scaling_buffer_seconds": 600,
+        "predictive_scaling_cpu_target": 50,
+        
+        "enable_monitoring": "false",
+        "alarm_email": "",
+        "log_retention_days": 14,
+        "alarm_latency_p95_ms": 1500,
+        "alarm_latency_p99_ms": 3000,
+        "alarm_5xx_count": 10,
+        "alarm_memory_used_percent": 90,
+        "alarm_disk_used_percent": 85,
+        
+        "enable_web_performance": "false",
+        "static_asset_max_age_days": 365,
+        
+        "availability_zone_count": 2,
+        "enable_efs": "false",
+        "efs_throughput_mode": "elastic",
+        "efs_provisioned_throughput_mibps": 10,
+        "efs_attribute_cache_seconds": 30,
+        "efs_storage_estimate_gb": 10,
     }
     
-    if os.path.exists(env_file_path):
-        print(f"Reading configuration from {env_file_path}...")
-        # print(f"env file path: {}")
-        with open(env_file_path, 'r') as f:
-            for line in f:
-                # print(f"line {line}")
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    try:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-
-                        need_values_keys = ["EC2_AMI_ID", "WORDPRESS_ADMIN_PASSWORD", "WORDPRESS_DB_PASSWORD"]
-                        bool_keys = ["USE_RDS", "ENABLE_AUTO_SCALING", "ENABLE_S3_MEDIA", "ENABLE_CLOUDFRONT"]
-                        int_keys = ["RDS_STORAGE_SIZE", "MIN_INSTANCES", "MAX_INSTANCES", "SCALE_UP_CPU_THRESHOLD", "SCALE_DOWN_CPU_THRESHOLD", "INSTANCE_VOLUME_SIZE"]
-                        
-                        if key in need_values_keys and value:
-                            env_vars[key.lower()] = value
-                        elif key in bool_keys:
-                            env_vars[key.lower()] = value.lower()
-                        elif key in int_keys:
-                            try:
-                                env_vars[key.lower()] = int(value)
-                            except ValueError:
-                                pass
-                        else:
-                            env_vars[key.lower()] = value
-                    except ValueError:
-                        continue
+    for key, value in env_values:
+        set_env_value(env_vars, key, value)
     
     # Special processing
     if not env_vars["wordpress_admin_password"]:
@@ -94,6 +176,9 @@ def parse_env_file(env_file_path):
     
     if not env_vars["wordpress_domain"]:
         env_vars["wordpress_domain"] = f"{env_vars['project_name']}.example.com"
+    
+    if isinstance(env_vars["scaling_schedules"], str):
+        env_vars["scaling_schedules"] = parse_scaling_schedules(env_vars["scaling_schedules"])
 
         # print(f"env vars: {env_vars}")
     
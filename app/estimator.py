@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Estimateur hors ligne du coût mensuel et de la capacité de chaque type de déploiement.
+Parcourt les composants réellement rendus de DEPLOYMENT_TEMPLATES avec les valeurs du .env et les
+tables embarquées de pricing_tables.py, sans appeler l'API AWS.
+"""
+
+import sys
+import json
+import argparse
+from contextlib import redirect_stdout
+
+from deployment_templates import DEPLOYMENT_TEMPLATES, rendered_components
+from db_tuning import uses_local_database, check_shared_state
+from env_parser import parse_env_file, ConfigurationError
+from pricing_tables import (
+    PRICING_REGION,
+    HOURS_PER_MONTH,
+    WORDPRESS_RPS_PER_VCPU,
+    COLOCATED_DB_CPU_SHARE,
+    EC2_INSTANCE_TYPES,
+    RDS_INSTANCE_CLASSES,
+    STORAGE_PRICES,
+    NETWORK_PRICES,
+    MONITORING_PRICES,
+)
+
+ENV_FILE_DEFAULT = '.env'
+
+AUTO_SCALING_COMPONENTS = ("auto_scaling_group", "launch_template")
+PUBLIC_SUBNET_COMPONENTS = ("public_subnet", "subnet_multi_az")
+
+# Metrics published by the CloudWatch agent: mem (2), swap, disk, Apache (3) and PHP-FPM (4) status gauges
+AGENT_METRICS = 11
+# Metrics derived from the logs (MariaDB slow queries)
+LOG_METRICS = 1
+# EC2 metrics billed per instance with detailed (1-minute) monitoring
+DETAILED_MONITORING_METRICS = 7
+MONITORING_DASHBOARDS = ("monitoring", "monitoring_alb")
+# Alarm metrics per monitoring component (a metric math alarm is billed per metric)
+MONITORING_ALARM_METRICS = {"monitoring_instance_alarms": 3, "monitoring_alb": 4}
+
+
+def instance_count(components, env_vars):
+    """Return the (min, max) number of EC2 instances a deployment runs."""
+    if any(component in components for component in AUTO_SCALING_COMPONENTS):
+        # Scheduled actions may raise the group's maximum during peaks
+        scheduled_max = [schedule["max_size"] for schedule in env_vars["scaling_schedules"]]
+        return int(env_vars["min_instances"]), max([int(env_vars["min_instances"]), int(env_vars["max_instances"])] + scheduled_max)
+    if "ec2_instance" in components:
+        return 1, 1
+    return 0, 0
+
+def warm_pool_size(env_vars, min_instances, max_instances):
+    """Return the (min, max) number of stopped instances kept in the warm pool."""
+    pool_min = int(env_vars["warm_pool_min_size"])
+    prepared = int(env_vars["warm_pool_max_prepared_capacity"]) or max_instances
+    return pool_min, max(pool_min, prepared - min_instances)
+
+def custom_metric_series(components, min_instances, max_instances):
+    """Return the (min, max) number of custom metric series the monitoring publishes."""
+    # In an Auto Scaling group each instance publishes the full dimension set and the
+    # InstanceId aggregate, and the group adds one AutoScalingGroupName aggregate per metric
+    in_group = "auto_scaling_group" in components
+    per_instance = AGENT_METRICS * 2 if in_group else AGENT_METRICS
+    per_group = AGENT_METRICS if in_group else 0
+    return (per_instance * min_instances + per_group + LOG_METRICS,
+            per_instance * max_instances + per_group + LOG_METRICS)
+
+def alarm_metrics(components, env_vars):
+    """Return the number of alarm metrics a deployment creates."""
+    monitoring = "monitoring" in components and env_vars["enable_monitoring"] == "true"
+    count = sum(metrics for component, metrics in MONITORING_ALARM_METRICS.items()
+                if monitoring and component in components)
+
+    if "auto_scaling_group" in components and env_vars["enable_auto_scaling"] == "true":
+        # cpu_high and cpu_low, the PHP-FPM queue alarm, and the two alarms managed by target tracking
+        count += 2
+        if monitoring:
+            count += 1
+        if int(env_vars["scale_requests_per_target"]) > 0:
+            count += 2
+
+    return count
+
+def add_line_item(line_items, label, monthly_min, monthly_max=None):
+    """Append a monthly cost line, as a (min, max) range when it scales with instances."""
+    line_items.append({
+        "item": label,
+        "monthly_min": round(monthly_min, 2),
+        "monthly_max": round(monthly_max if monthly_max is not None else monthly_min, 2),
+    })
+
+def estimate_deployment(deployment_type, env_vars):
+    """Estimate the monthly cost and requests/sec ceiling of a deployment type."""
+    # Components without a Terraform template are skipped by the generator, so they cost nothing
+    components = rendered_components(deployment_type)
+    line_items = []
+    warnings = []
+
+    min_instances, max_instances = instance_count(components, env_vars)
+    colocated_db = uses_local_database(deployment_type, env_vars)
+    try:
+        check_shared_state(deployment_type, env_vars)
+    except ConfigurationError as e:
+        warnings.append(f"Not generated: {e}")
+    if colocated_db and env_vars["use_rds"] == "true":
+        warnings.append("USE_RDS is set but no RDS instance is rendered: MariaDB runs on the instances")
+
+    # Compute
+    instance_type = env_vars["instance_type"]
+    instance = EC2_INSTANCE_TYPES.get(instance_type)
+    if min_instances and instance is None:
+        warnings.append(f"Unknown instance type '{instance_type}': EC2 cost and capacity not estimated")
+    elif min_instances:
+        monthly = instance["hourly"] * HOURS_PER_MONTH
+        add_line_item(line_items, f"EC2 {instance_type} x {min_instances}-{max_instances}",
+                      monthly * min_instances, monthly * max_instances)
+
+        volume_monthly = int(env_vars["instance_volume_size"]) * STORAGE_PRICES["ebs_gp3_gb_month"]
+        add_line_item(line_items, f"EBS gp3 {env_vars['instance_volume_size']} GB per instance",
+                      volume_monthly * min_instances, volume_monthly * max_instances)
+
+        # Stopped warm pool instances only pay for their volume
+        if "auto_scaling_group" in components and env_vars["enable_warm_pool"] == "true":
+            warm_min, warm_max = warm_pool_size(env_vars, min_instances, max_instances)
+            add_line_item(line_items, f"Warm pool EBS (stopped) x {warm_min}-{warm_max}",
+                          volume_monthly * warm_min, volume_monthly * warm_max)
+
+        if any(component in components for component in PUBLIC_SUBNET_COMPONENTS):
+            ip_monthly = NETWORK_PRICES["public_ipv4_hourly"] * HOURS_PER_MONTH
+            add_line_item(line_items, "Public IPv4 per instance", ip_monthly * min_instances, ip_monthly * max_instances)
+
+    # Database
+    db_rps = None
+    if not colocated_db:
+        rds_class = env_vars["rds_instance_class"]
+        rds = RDS_INSTANCE_CLASSES.get(rds_class)
+        multi_az = env_vars["rds_multi_az"] == "true"
+        copies = 2 if multi_az else 1
+        if rds is None:
+            warnings.append(f"Unknown RDS class '{rds_class}': database cost and capacity not estimated")
+        else:
+            label = f"RDS {rds_class}{' Multi-AZ' if multi_az else ''}"
+            add_line_item(line_items, label, rds["hourly"] * HOURS_PER_MONTH * copies)
+            db_rps = rds["wordpress_rps"]
+        add_line_item(line_items, f"RDS storage {env_vars['rds_storage_size']} GB",
+                      int(env_vars["rds_storage_size"]) * STORAGE_PRICES["rds_gp2_gb_month"] * copies)
+
+    # Shared uploads
+    if "efs" in components and env_vars["enable_efs"] == "true":
+        add_line_item(line_items, f"EFS Standard {env_vars['efs_storage_estimate_gb']} GB",
+                      int(env_vars["efs_storage_estimate_gb"]) * STORAGE_PRICES["efs_standard_gb_month"])
+        if env_vars["efs_throughput_mode"] == "provisioned":
+            add_line_item(line_items, f"EFS provisioned {env_vars['efs_provisioned_throughput_mibps']} MiB/s",
+                          int(env_vars["efs_provisioned_throughput_mibps"]) * STORAGE_PRICES["efs_provisioned_mibps_month"])
+
+    # Network
+    if "load_balancer" in components:
+        add_line_item(line_items, "Application Load Balancer (1 LCU)",
+                      (NETWORK_PRICES["alb_hourly"] + NETWORK_PRICES["alb_lcu_hourly"]) * HOURS_PER_MONTH)
+
+    # Monitoring
+    if "launch_template" in components and min_instances:
+        detailed_monthly = DETAILED_MONITORING_METRICS * MONITORING_PRICES["custom_metric_month"]
+        add_line_item(line_items, "EC2 detailed monitoring per instance",
+                      detailed_monthly * min_instances, detailed_monthly * max_instances)
+    if "monitoring" in components and env_vars["enable_monitoring"] == "true":
+        series_min, series_max = custom_metric_series(components, min_instances, max_instances)
+        series = f"{series_min}-{series_max}" if series_min != series_max else series_min
+        add_line_item(line_items, f"CloudWatch custom metrics x {series}",
+                      series_min * MONITORING_PRICES["custom_metric_month"],
+                      series_max * MONITORING_PRICES["custom_metric_month"])
+        dashboards = sum(1 for component in MONITORING_DASHBOARDS if component in components)
+        add_line_item(line_items, f"CloudWatch dashboards x {dashboards}",
+                      dashboards * MONITORING_PRICES["dashboard_month"])
+    alarms = alarm_metrics(components, env_vars)
+    if alarms:
+        add_line_item(line_items, f"CloudWatch alarm metrics x {alarms}",
+                      alarms * MONITORING_PRICES["alarm_metric_month"])
+
+    # Capacity
+    capacity = None
+    if instance is not None and min_instances:
+        burst_rps = instance["vcpu"] * WORDPRESS_RPS_PER_VCPU
+        if colocated_db:
+            burst_rps *= COLOCATED_DB_CPU_SHARE
+        sustained_rps = burst_rps * instance["baseline_cpu"]
+
+        capacity = {
+            "sustained_rps_min": sustained_rps * min_instances,
+            "sustained_rps_max": sustained_rps * max_instances,
+            "burst_rps_min": burst_rps * min_instances,
+            "burst_rps_max": burst_rps * max_instances,
+            "database_rps": db_rps,
+            "colocated_database": colocated_db,
+        }
+        if db_rps is not None:
+            for key in ("sustained_rps_min", "sustained_rps_max", "burst_rps_min", "burst_rps_max"):
+                capacity[key] = min(capacity[key], db_rps)
+        capacity = {key: round(float(value), 1) if key.endswith("_rps_min") or key.endswith("_rps_max") else value
+                    for key, value in capacity.items()}
+
+    return {
+        "deployment_type": deployment_type,
+        "instances": {"min": min_instances, "max": max_instances},
+        "line_items": line_items,
+        "monthly_min": round(sum(item["monthly_min"] for item in line_items), 2),
+        "monthly_max": round(sum(item["monthly_max"] for item in line_items), 2),
+        "capacity": capacity,
+        "warnings": warnings,
+    }
+
+def format_estimate(estimate):
+    """Format an estimate as a human readable report."""
+    title = estimate["deployment_type"].replace("-", " ").title()
+    lines = ["", "=" * 60, f"  {title}", "=" * 60]
+
+    for item in estimate["line_items"]:
+        if item["monthly_min"] == item["monthly_max"]:
+            cost = f"${item['monthly_min']:.2f}"
+        else:
+            cost = f"${item['monthly_min']:.2f} - ${item['monthly_max']:.2f}"
+        lines.append(f"  {item['item']:<38}{cost:>20}")
+
+    lines.append("-" * 60)
+    if estimate["monthly_min"] == estimate["monthly_max"]:
+        total = f"${estimate['monthly_min']:.2f}"
+    else:
+        total = f"${estimate['monthly_min']:.2f} - ${estimate['monthly_max']:.2f}"
+    lines.append(f"  {'Estimated monthly cost':<38}{total:>20}")
+
+    capacity = estimate["capacity"]
+    if capacity:
+        lines.append(f"  {'Sustained ceiling (uncached req/s)':<38}"
+                     f"{capacity['sustained_rps_min']:>9} - {capacity['sustained_rps_max']}")
+        lines.append(f"  {'Burst ceiling (uncached req/s)':<38}"
+                     f"{capacity['burst_rps_min']:>9} - {capacity['burst_rps_max']}")
+        if capacity["colocated_database"]:
+            lines.append("  MariaDB shares the instance CPU with PHP")
+        elif capacity["database_rps"] is not None:
+            lines.append(f"  Database ceiling: {capacity['database_rps']} req/s")
+
+    for warning in estimate["warnings"]:
+        lines.append(f"  Warning: {warning}")
+
+    return "\n".join(lines)
+
+def parse_command_line_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Estimate monthly cost and capacity of WordPress deployments.')
+    parser.add_argument('--env', '-e', default=ENV_FILE_DEFAULT, help=f'Path to .env file (default: {ENV_FILE_DEFAULT})')
+    parser.add_argument('--type', '-t', choices=list(DEPLOYMENT_TEMPLATES.keys()), help='Deployment type (default: all)')
+    parser.add_argument('--json', action='store_true', help='Print the estimates as JSON')
+    return parser.parse_args()
+
+def main():
+    """Main function to run the estimator."""
+    args = parse_command_line_args()
+    with redirect_stdout(sys.stderr):
+        env_vars = parse_env_file(args.env)
+
+    deployment_types = [args.type] if args.type else list(DEPLOYMENT_TEMPLATES.keys())
+    estimates = [estimate_deployment(deployment_type, env_vars) for deployment_type in deployment_types]
+
+    if args.json:
+        json.dump(estimates, sys.stdout, indent=2)
+        print()
+        return
+
+    for estimate in estimates:
+        print(format_estimate(estimate))
+
+    print(f"\nOn-demand {PRICING_REGION} list prices, {HOURS_PER_MONTH} h/month, data transfer excluded.")
+    if env_vars["aws_region"] != PRICING_REGION:
+        print(f"Note: prices in {env_vars['aws_region']} are usually slightly higher.")
+    print(f"Capacity assumes ~{WORDPRESS_RPS_PER_VCPU} uncached WordPress pages/s per vCPU; "
+          "sustained figures use the burstable CPU baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Générateur de plans de test de charge et analyseur de résultats.
+
+generate  écrit k6.js, locustfile.py et run.sh dans <output>/loadtest, avec les
+          scénarios anonyme, connecté et wp-admin visant load_balancer_dns
+run       petit injecteur intégré (sans k6 ni locust) produisant le même results.json
+analyze   compare les percentiles de latence et le débit à une baseline
+stub      serveur HTTP imitant WordPress pour tester run/analyze en local
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import redirect_stdout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookiejar import CookieJar
+
+from app import render_template, ENV_FILE_DEFAULT, DEFAULT_OUTPUT_DIR
+from env_parser import parse_env_file
+from loadtest_templates import LOADTEST_TEMPLATES
+
+LOADTEST_DIR = 'loadtest'
+DEFAULT_DURATION = '2m'
+DEFAULT_TOLERANCE = 10
+ERROR_RATE_TOLERANCE = 0.01
+
+SCENARIOS = {
+    "anonymous": {"login": False, "paths": ["/", "/?s=hello", "/?p=1"]},
+    "logged_in": {"login": True, "paths": ["/", "/?p=1"]},
+    "wp_admin": {"login": True, "paths": ["/wp-admin/", "/wp-admin/edit.php"]},
+}
+
+DEFAULT_VUS = {"anonymous": 20, "logged_in": 5, "wp_admin": 2}
+
+# Sorties Terraform désignant la cible, dans l'ordre de préférence (comme run.sh)
+TARGET_OUTPUTS = ("load_balancer_dns", "instance_ip")
+
+
+def percentile(samples, pct):
+    """Return the pct percentile of a sorted list of samples."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+def summarize(latencies, errors, seconds):
+    """Build the results.json entry of a scenario from raw latencies (ms)."""
+    samples = sorted(latencies)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "duration_s": seconds,
+        "rps": len(samples) / seconds if seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        },
+    }
+
+def is_login_redirect(response):
+    """Tell whether a followed redirect landed on the login form (session missing or rejected)."""
+    return urllib.parse.urlparse(response.geturl()).path.endswith("/wp-login.php")
+
+def terraform_target_url(output_dir):
+    """Return http://<load_balancer_dns or instance_ip> from the applied stack, or "" if unknown."""
+    for output in TARGET_OUTPUTS:
+        try:
+            result = subprocess.run(["terraform", "output", "-raw", output], cwd=output_dir,
+                                    capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+        if result.returncode == 0 and result.stdout.strip():
+            return f"http://{result.stdout.strip()}"
+    return ""
+
+def generate_plan(env_vars, output_dir, duration=DEFAULT_DURATION, vus=None):
+    """Write the k6/locust load-test plan for a generated deployment."""
+    vus = {**DEFAULT_VUS, **(vus or {})}
+    loadtest_dir = os.path.join(output_dir, LOADTEST_DIR)
+    os.makedirs(loadtest_dir, exist_ok=True)
+
+    values = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        # Le domaine du .env est souvent le substitut *.example.com: seule la pile
+        # déployée fait foi, sinon TARGET_URL devra être fourni à l'exécution
+        "loadtest_target_url": terraform_target_url(output_dir),
+        "loadtest_wp_user": env_vars["wordpress_admin_user"],
+        "loadtest_duration": duration,
+        "loadtest_anonymous_vus": vus["anonymous"],
+        "loadtest_logged_in_vus": vus["logged_in"],
+        "loadtest_wp_admin_vus": vus["wp_admin"],
+        "loadtest_total_vus": sum(vus.values()),
+        "loadtest_script": os.path.relpath(os.path.abspath(__file__), os.path.abspath(loadtest_dir)),
+    }
+
+    for filename, template in LOADTEST_TEMPLATES.items():
+        content, _ = render_template(template, values)
+        file_path = os.path.join(loadtest_dir, filename)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        if filename.endswith(".sh"):
+            os.chmod(file_path, 0o755)
+        print(f"Created: {file_path}")
+
+    return loadtest_dir
+
+def run_scenario(target_url, name, concurrency, duration, credentials, results, lock):
+    """Drive one scenario with `concurrency` threads for `duration` seconds."""
+    scenario = SCENARIOS[name]
+    latencies = []
+    errors = [0]
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        if scenario["login"]:
+            data = urllib.parse.urlencode({"log": credentials[0], "pwd": credentials[1],
+                                           "wp-submit": "Log In", "testcookie": "1"}).encode()
+            try:
+                response = opener.open(f"{target_url}/wp-login.php", data, timeout=30)
+                response.read()
+                rejected = is_login_redirect(response)
+            except (urllib.error.URLError, OSError):
+                rejected = True
+            if rejected:
+                with lock:
+                    errors[0] += 1
+        while time.perf_counter() < deadline:
+            for path in scenario["paths"]:
+                start = time.perf_counter()
+                try:
+                    response = opener.open(f"{target_url}{path}", timeout=30)
+                    response.read()
+                    # Renvoyé vers le formulaire de connexion: la page visée n'a pas été servie
+                    failed = scenario["login"] and is_login_redirect(response)
+                except (urllib.error.URLError, OSError):
+                    failed = True
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += failed
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with lock:
+        results[name] = summarize(latencies, errors[0], time.perf_counter() - started)
+
+def run_load(target_url, duration, vus, credentials):
+    """Run the selected scenarios concurrently and return a results dictionary."""
+    target_url = target_url.rstrip("/")
+    results = {}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=run_scenario,
+                         args=(target_url, name, count, duration, credentials, results, lock))
+        for name, count in vus.items() if count > 0
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"tool": "loadtest.py", "target": target_url, "scenarios": results}
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results against a baseline and return (rows, regressions)."""
+    rows = []
+    regressions = []
+    factor = tolerance / 100
+
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results.get("scenarios", {}).get(name)
+        if current is None:
+            regressions.append(f"{name}: scenario missing from results")
+            continue
+
+        for key in ("p50", "p95", "p99"):
+            base_value = base["latency_ms"][key]
+            value = current["latency_ms"][key]
+            regressed = value > base_value * (1 + factor)
+            rows.append((name, f"{key} ms", base_value, value, regressed))
+            if regressed:
+                regressions.append(f"{name}: {key} latency {value:.1f} ms > baseline {base_value:.1f} ms (+{tolerance}%)")
+
+        regressed = current["rps"] < base["rps"] * (1 - factor)
+        rows.append((name, "req/s", base["rps"], current["rps"], regressed))
+        if regressed:
+            regressions.append(f"{name}: throughput {current['rps']:.1f} req/s < baseline {base['rps']:.1f} req/s (-{tolerance}%)")
+
+        base_error_rate = base["errors"] / base["requests"] if base["requests"] else 0.0
+        error_rate = current["errors"] / current["requests"] if current["requests"] else 1.0
+        regressed = error_rate > base_error_rate + ERROR_RATE_TOLERANCE
+        rows.append((name, "error %", base_error_rate * 100, error_rate * 100, regressed))
+        if regressed:
+            regressions.append(f"{name}: error rate {error_rate:.1%} > baseline {base_error_rate:.1%}")
+
+    return rows, regressions
+
+def analyze(results_path, baseline_path, tolerance=DEFAULT_TOLERANCE, update_baseline=False):
+    """Print the comparison table and return a process exit code."""
+    with open(results_path) as f:
+        results = json.load(f)
+
+    if update_baseline or not os.path.exists(baseline_path):
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path} ({', '.join(results.get('scenarios', {}))})")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    rows, regressions = compare_results(results, baseline, tolerance)
+
+    print(f"\n{'scenario':<12}{'metric':<10}{'baseline':>12}{'current':>12}")
+    print("=" * 50)
+    for name, metric, base_value, value, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<12}{metric:<10}{base_value:>12.1f}{value:>12.1f}{flag}")
+    print("=" * 50)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {baseline_path}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"\nNo regression against {baseline_path} (tolerance {tolerance}%).")
+    return 0
+
+class StubWordPressHandler(BaseHTTPRequestHandler):
+    """Minimal WordPress look-alike used to exercise the runner and analyzer locally."""
+
+    delay = 0.0
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, body=b"", headers=None):
+        time.sleep(self.delay)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urllib.parse.urlparse(self.path).path
+        if path.startswith("/wp-admin"):
+            if "wordpress_logged_in_stub" not in self.headers.get("Cookie", ""):
+                self.respond(302, headers={"Location": "/wp-login.php"})
+                return
+            self.respond(200, b"<html><body>Dashboard</body></html>")
+        elif path in ("/", "/index.php", "/wp-login.php"):
+            self.respond(200, b"<html><body>Hello world!</body></html>")
+        else:
+            self.respond(404, b"<html><body>Not found</body></html>")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if urllib.parse.urlparse(self.path).path == "/wp-login.php":
+            self.respond(302, headers={"Location": "/wp-admin/",
+                                       "Set-Cookie": "wordpress_logged_in_stub=1; Path=/"})
+        else:
+            self.respond(404)
+
+def start_stub_server(host="127.0.0.1", port=0, delay_ms=0):
+    """Start the stub server in a background thread and return it."""
+    handler = type("StubHandler", (StubWordPressHandler,), {"delay": delay_ms / 1000})
+    server_class = type("StubServer", (ThreadingHTTPServer,), {"request_queue_size": 256})
+    server = server_class((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def parse_command_line_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Generate and analyze load tests for deployed WordPress stacks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help='Write the k6/locust plan into <output>/loadtest')
+    generate.add_argument('--env', '-e', default=ENV_FILE_DEFAULT, help=f'Path to .env file (default: {ENV_FILE_DEFAULT})')
+    generate.add_argument('--output', '-o', default=DEFAULT_OUTPUT_DIR, help=f'Terraform output directory (default: {DEFAULT_OUTPUT_DIR})')
+    generate.add_argument('--duration', default=DEFAULT_DURATION, help=f'Test duration (default: {DEFAULT_DURATION})')
+    for name, count in DEFAULT_VUS.items():
+        generate.add_argument(f'--{name.replace("_", "-")}-vus', type=int, default=count, help=f'Virtual users for the {name} scenario (default: {count})')
+
+    run = subparsers.add_parser('run', help='Run the scenarios with the built-in load generator')
+    run.add_argument('--target', required=True, help='Base URL, e.g. http://<load_balancer_dns>')
+    run.add_argument('--duration', type=float, default=30, help='Duration in seconds (default: 30)')
+    run.add_argument('--results', default='results.json', help='Results file (default: results.json)')
+    for name, count in DEFAULT_VUS.items():
+        run.add_argument(f'--{name.replace("_", "-")}-vus', type=int, default=count, help=f'Concurrent users for the {name} scenario (default: {count})')
+
+    analyze_parser = subparsers.add_parser('analyze', help='Compare results with a stored baseline')
+    analyze_parser.add_argument('results', help='results.json written by k6, locust or run')
+    analyze_parser.add_argument('--baseline', default='baseline.json', help='Baseline file, created from the results if missing (default: baseline.json)')
+    analyze_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help=f'Allowed degradation in percent (default: {DEFAULT_TOLERANCE})')
+    analyze_parser.add_argument('--update-baseline', action='store_true', help='Replace the baseline with these results')
+
+    stub = subparsers.add_parser('stub', help='Serve a WordPress look-alike for local testing')
+    stub.add_argument('--port', '-p', type=int, default=8081, help='Listen port (default: 8081)')
+    stub.add_argument('--delay-ms', type=float, default=0, help='Added latency per response in ms (default: 0)')
+
+    return parser.parse_args()
+
+def main():
+    """Main function to run the load-test tooling."""
+    args = parse_command_line_args()
+
+    if args.command == 'generate':
+        with redirect_stdout(sys.stderr):
+            env_vars = parse_env_file(args.env)
+        vus = {name: getattr(args, f"{name}_vus") for name in DEFAULT_VUS}
+        generate_plan(env_vars, args.output, args.duration, vus)
+
+    elif args.command == 'run':
+        vus = {name: getattr(args, f"{name}_vus") for name in DEFAULT_VUS}
+        credentials = (os.environ.get("WP_USER", "admin"), os.environ.get("WP_PASSWORD", ""))
+        results = run_load(args.target, args.duration, vus, credentials)
+        with open(args.results, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.results}")
+
+    elif args.command == 'analyze':
+        sys.exit(analyze(args.results, args.baseline, args.tolerance, args.update_baseline))
+
+    elif args.command == 'stub':
+        server = start_stub_server(port=args.port, delay_ms=args.delay_ms)
+        print(f"Stub WordPress listening on http://127.0.0.1:{server.server_address[1]}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+LOADTEST_TEMPLATES = {
+    "k6.js": """// k6 load-test plan for WordPress - generated on {date}
+// Usage: k6 run -e TARGET_URL=http://<load_balancer_dns> -e WP_PASSWORD=... k6.js
+// Authenticated requests are failures when WordPress sends them back to wp-login.php.
+// Writes results.json (scenario percentiles and throughput) for loadtest.py analyze.
+import http from 'k6/http';
+import { check, sleep } from 'k6';
+
+const TARGET_URL = (__ENV.TARGET_URL || '{loadtest_target_url}').replace(/\\/$/, '');
+if (!TARGET_URL) {
+  throw new Error('Set TARGET_URL (http://<load_balancer_dns>) or regenerate the plan after terraform apply');
+}
+const WP_USER = __ENV.WP_USER || '{loadtest_wp_user}';
+const WP_PASSWORD = __ENV.WP_PASSWORD || '';
+const DURATION = __ENV.DURATION || '{loadtest_duration}';
+const SCENARIOS = ['anonymous', 'logged_in', 'wp_admin'];
+
+export const options = {
+  summaryTrendStats: ['avg', 'min', 'max', 'p(50)', 'p(95)', 'p(99)'],
+  scenarios: {
+    anonymous: { executor: 'constant-vus', exec: 'anonymous', vus: {loadtest_anonymous_vus}, duration: DURATION },
+    logged_in: { executor: 'constant-vus', exec: 'loggedIn', vus: {loadtest_logged_in_vus}, duration: DURATION },
+    wp_admin: { executor: 'constant-vus', exec: 'wpAdmin', vus: {loadtest_wp_admin_vus}, duration: DURATION },
+  },
+  thresholds: Object.fromEntries(SCENARIOS.flatMap((name) => [
+    [`http_req_duration{scenario:${name}}`, ['p(99)<5000']],
+    [`http_reqs{scenario:${name}}`, ['count>=0']],
+    [`http_req_failed{scenario:${name}}`, ['rate<0.05']],
+  ])),
+};
+
+function login() {
+  const res = http.post(`${TARGET_URL}/wp-login.php`, {
+    log: WP_USER,
+    pwd: WP_PASSWORD,
+    'wp-submit': 'Log In',
+    redirect_to: `${TARGET_URL}/wp-admin/`,
+    testcookie: '1',
+  }, {
+    cookies: { wordpress_test_cookie: 'WP Cookie check' },
+    redirects: 0,
+    // A rejected login re-renders the form with a 200: only the redirect means success
+    responseCallback: http.expectedStatuses(302),
+  });
+  check(res, { 'login accepted': (r) => r.status === 302 });
+}
+
+// wp-admin pages are fetched without following redirects, so a 302 to
+// wp-login.php (lost or rejected session) is counted in http_req_failed.
+const ADMIN_PARAMS = { redirects: 0, responseCallback: http.expectedStatuses(200) };
+
+function notLoginPage(r) {
+  return r.status === 200 && !r.url.includes('/wp-login.php');
+}
+
+export function anonymous() {
+  check(http.get(`${TARGET_URL}/`), { 'home 200': (r) => r.status === 200 });
+  check(http.get(`${TARGET_URL}/?s=hello`), { 'search 200': (r) => r.status === 200 });
+  check(http.get(`${TARGET_URL}/?p=1`), { 'post 200': (r) => r.status === 200 });
+  sleep(1);
+}
+
+export function loggedIn() {
+  if (__ITER === 0) login();
+  check(http.get(`${TARGET_URL}/`), { 'home 200': notLoginPage });
+  check(http.get(`${TARGET_URL}/?p=1`), { 'post 200': notLoginPage });
+  sleep(1);
+}
+
+export function wpAdmin() {
+  if (__ITER === 0) login();
+  check(http.get(`${TARGET_URL}/wp-admin/`, ADMIN_PARAMS), { 'dashboard 200': (r) => r.status === 200 });
+  check(http.get(`${TARGET_URL}/wp-admin/edit.php`, ADMIN_PARAMS), { 'posts 200': (r) => r.status === 200 });
+  sleep(2);
+}
+
+export function handleSummary(data) {
+  const seconds = data.state.testRunDurationMs / 1000;
+  const scenarios = {};
+  for (const name of SCENARIOS) {
+    const duration = data.metrics[`http_req_duration{scenario:${name}}`];
+    const reqs = data.metrics[`http_reqs{scenario:${name}}`];
+    const failed = data.metrics[`http_req_failed{scenario:${name}}`];
+    if (!duration || !reqs || !reqs.values.count) continue;
+    scenarios[name] = {
+      requests: reqs.values.count,
+      errors: failed ? failed.values.passes : 0,
+      duration_s: seconds,
+      rps: reqs.values.count / seconds,
+      latency_ms: {
+        p50: duration.values['p(50)'],
+        p95: duration.values['p(95)'],
+        p99: duration.values['p(99)'],
+      },
+    };
+  }
+  return {
+    'results.json': JSON.stringify({ tool: 'k6', target: TARGET_URL, scenarios: scenarios }, null, 2),
+    stdout: `k6 results written to results.json (${Object.keys(scenarios).join(', ')})\\n`,
+  };
+}
+""",
+
+    "locustfile.py": """# Locust load-test plan for WordPress - generated on {date}
+# Usage: locust -f locustfile.py --headless -H http://<load_balancer_dns> -u 20 -r 5 -t {loadtest_duration}
+# Authenticated requests are failures when WordPress sends them back to wp-login.php.
+# Writes results.json (scenario percentiles and throughput) for loadtest.py analyze.
+import os
+import json
+import time
+
+from locust import HttpUser, between, events, task
+
+WP_USER = os.environ.get("WP_USER", "{loadtest_wp_user}")
+WP_PASSWORD = os.environ.get("WP_PASSWORD", "")
+SCENARIOS = ["anonymous", "logged_in", "wp_admin"]
+STARTED_AT = time.time()
+
+
+def login(client, name):
+    # A rejected login re-renders the form with a 200: only the redirect means success
+    with client.post("/wp-login.php", name=name, data={
+        "log": WP_USER,
+        "pwd": WP_PASSWORD,
+        "wp-submit": "Log In",
+        "testcookie": "1",
+    }, cookies={"wordpress_test_cookie": "WP Cookie check"}, allow_redirects=False,
+            catch_response=True) as response:
+        if response.status_code != 302 or "wp-login.php" in response.headers.get("Location", ""):
+            response.failure(f"login rejected ({response.status_code})")
+
+
+def get_authenticated(client, path, name):
+    # Not following redirects: a 302 to wp-login.php means the session was lost
+    with client.get(path, name=name, allow_redirects=False, catch_response=True) as response:
+        if response.status_code != 200:
+            response.failure(f"{response.status_code} {response.headers.get('Location', '')}".strip())
+
+
+class AnonymousUser(HttpUser):
+    weight = {loadtest_anonymous_vus}
+    wait_time = between(0.5, 1.5)
+
+    @task
+    def browse(self):
+        self.client.get("/", name="anonymous")
+        self.client.get("/?s=hello", name="anonymous")
+        self.client.get("/?p=1", name="anonymous")
+
+
+class LoggedInUser(HttpUser):
+    weight = {loadtest_logged_in_vus}
+    wait_time = between(0.5, 1.5)
+
+    def on_start(self):
+        login(self.client, "logged_in")
+
+    @task
+    def browse(self):
+        self.client.get("/", name="logged_in")
+        self.client.get("/?p=1", name="logged_in")
+
+
+class AdminUser(HttpUser):
+    weight = {loadtest_wp_admin_vus}
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        login(self.client, "wp_admin")
+
+    @task
+    def dashboard(self):
+        get_authenticated(self.client, "/wp-admin/", "wp_admin")
+        get_authenticated(self.client, "/wp-admin/edit.php", "wp_admin")
+
+
+@events.quitting.add_listener
+def write_results(environment, **kwargs):
+    seconds = time.time() - STARTED_AT
+    scenarios = {}
+    for name in SCENARIOS:
+        entries = [entry for (entry_name, _), entry in environment.stats.entries.items() if entry_name == name]
+        if not entries:
+            continue
+        total = entries[0]
+        for entry in entries[1:]:
+            total.extend(entry)
+        if not total.num_requests:
+            continue
+        scenarios[name] = {
+            "requests": total.num_requests,
+            "errors": total.num_failures,
+            "duration_s": seconds,
+            "rps": total.num_requests / seconds,
+            "latency_ms": {
+                "p50": total.get_response_time_percentile(0.50),
+                "p95": total.get_response_time_percentile(0.95),
+                "p99": total.get_response_time_percentile(0.99),
+            },
+        }
+    with open("results.json", "w") as f:
+        json.dump({"tool": "locust", "target": environment.host, "scenarios": scenarios}, f, indent=2)
+""",
+
+    "run.sh": """#!/bin/bash
+# Run the load-test plan against the deployed stack and compare with the baseline.
+# Usage: ./run.sh [k6|locust]   (TARGET_URL, WP_USER, WP_PASSWORD, DURATION may be set)
+# Generated on: {date}
+set -e
+
+LOADTEST_DIR="$(cd "$(dirname "$0")" && pwd)"
+TOOL="${1:-k6}"
+DURATION="${DURATION:-{loadtest_duration}}"
+
+if [ -z "$TARGET_URL" ]; then
+    HOST="$(cd "$LOADTEST_DIR/.." && (terraform output -raw load_balancer_dns 2>/dev/null || terraform output -raw instance_ip 2>/dev/null || true))"
+    if [ -z "$HOST" ]; then
+        echo "Set TARGET_URL or run 'terraform apply' first."
+        exit 1
+    fi
+    TARGET_URL="http://$HOST"
+fi
+
+cd "$LOADTEST_DIR"
+echo "Load testing $TARGET_URL with $TOOL for $DURATION..."
+
+if [ "$TOOL" = "locust" ]; then
+    locust -f locustfile.py --headless -H "$TARGET_URL" -u {loadtest_total_vus} -r {loadtest_total_vus} -t "$DURATION" --only-summary
+else
+    k6 run -e TARGET_URL="$TARGET_URL" -e DURATION="$DURATION" k6.js
+fi
+
+python3 "{loadtest_script}" analyze results.json --baseline baseline.json
+""",
+}
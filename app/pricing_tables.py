@@ -0,0 +1,78 @@
+# pricing_tables.py
+"""
+Tables de prix et de capacité embarquées, utilisées hors ligne par l'estimateur.
+Prix publics à la demande en us-east-1 (USD, Linux), relevés en 2025: ce sont
+des ordres de grandeur pour comparer les déploiements, pas une facture.
+
+Les capacités sont exprimées en pages WordPress dynamiques (non cachées) par
+seconde, en supposant ~80 ms de CPU PHP par page.
+"""
+
+PRICING_REGION = "us-east-1"
+HOURS_PER_MONTH = 730
+
+# Pages WordPress non cachées servies par seconde et par vCPU à 100% d'utilisation
+WORDPRESS_RPS_PER_VCPU = 12
+
+# Part du CPU restant à PHP quand MariaDB tourne sur la même instance
+COLOCATED_DB_CPU_SHARE = 0.75
+
+# baseline_cpu: part du vCPU garantie hors crédits pour les instances burstables
+EC2_INSTANCE_TYPES = {
+    "t2.micro":   {"hourly": 0.0116, "vcpu": 1, "memory_mib": 1024,  "baseline_cpu": 0.10},
+    "t2.small":   {"hourly": 0.0230, "vcpu": 1, "memory_mib": 2048,  "baseline_cpu": 0.20},
+    "t2.medium":  {"hourly": 0.0464, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 0.20},
+    "t2.large":   {"hourly": 0.0928, "vcpu": 2, "memory_mib": 8192,  "baseline_cpu": 0.30},
+    "t3.micro":   {"hourly": 0.0104, "vcpu": 2, "memory_mib": 1024,  "baseline_cpu": 0.10},
+    "t3.small":   {"hourly": 0.0208, "vcpu": 2, "memory_mib": 2048,  "baseline_cpu": 0.20},
+    "t3.medium":  {"hourly": 0.0416, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 0.20},
+    "t3.large":   {"hourly": 0.0832, "vcpu": 2, "memory_mib": 8192,  "baseline_cpu": 0.30},
+    "t3.xlarge":  {"hourly": 0.1664, "vcpu": 4, "memory_mib": 16384, "baseline_cpu": 0.40},
+    "t3a.micro":  {"hourly": 0.0094, "vcpu": 2, "memory_mib": 1024,  "baseline_cpu": 0.10},
+    "t3a.small":  {"hourly": 0.0188, "vcpu": 2, "memory_mib": 2048,  "baseline_cpu": 0.20},
+    "t3a.medium": {"hourly": 0.0376, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 0.20},
+    "t4g.micro":  {"hourly": 0.0084, "vcpu": 2, "memory_mib": 1024,  "baseline_cpu": 0.10},
+    "t4g.small":  {"hourly": 0.0168, "vcpu": 2, "memory_mib": 2048,  "baseline_cpu": 0.20},
+    "t4g.medium": {"hourly": 0.0336, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 0.20},
+    "m5.large":   {"hourly": 0.0960, "vcpu": 2, "memory_mib": 8192,  "baseline_cpu": 1.0},
+    "m5.xlarge":  {"hourly": 0.1920, "vcpu": 4, "memory_mib": 16384, "baseline_cpu": 1.0},
+    "m6i.large":  {"hourly": 0.0960, "vcpu": 2, "memory_mib": 8192,  "baseline_cpu": 1.0},
+    "c5.large":   {"hourly": 0.0850, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 1.0},
+    "c5.xlarge":  {"hourly": 0.1700, "vcpu": 4, "memory_mib": 8192,  "baseline_cpu": 1.0},
+    "c6i.large":  {"hourly": 0.0850, "vcpu": 2, "memory_mib": 4096,  "baseline_cpu": 1.0},
+}
+
+# wordpress_rps: pages non cachées par seconde que la base peut soutenir
+RDS_INSTANCE_CLASSES = {
+    "db.t3.micro":  {"hourly": 0.017, "vcpu": 2, "memory_mib": 1024,  "wordpress_rps": 150},
+    "db.t3.small":  {"hourly": 0.034, "vcpu": 2, "memory_mib": 2048,  "wordpress_rps": 300},
+    "db.t3.medium": {"hourly": 0.068, "vcpu": 2, "memory_mib": 4096,  "wordpress_rps": 600},
+    "db.t3.large":  {"hourly": 0.136, "vcpu": 2, "memory_mib": 8192,  "wordpress_rps": 1000},
+    "db.t4g.micro": {"hourly": 0.016, "vcpu": 2, "memory_mib": 1024,  "wordpress_rps": 150},
+    "db.t4g.small": {"hourly": 0.032, "vcpu": 2, "memory_mib": 2048,  "wordpress_rps": 300},
+    "db.t4g.medium": {"hourly": 0.065, "vcpu": 2, "memory_mib": 4096, "wordpress_rps": 600},
+    "db.m5.large":  {"hourly": 0.171, "vcpu": 2, "memory_mib": 8192,  "wordpress_rps": 1500},
+    "db.r5.large":  {"hourly": 0.250, "vcpu": 2, "memory_mib": 16384, "wordpress_rps": 2000},
+}
+
+# Prix mensuels au Go
+STORAGE_PRICES = {
+    "ebs_gp3_gb_month": 0.08,
+    "rds_gp2_gb_month": 0.115,
+    "efs_standard_gb_month": 0.30,
+    "efs_provisioned_mibps_month": 6.00,
+}
+
+# Prix horaires des composants réseau
+NETWORK_PRICES = {
+    "alb_hourly": 0.0225,
+    "alb_lcu_hourly": 0.008,
+    "public_ipv4_hourly": 0.005,
+}
+
+# Prix mensuels CloudWatch (offre gratuite ignorée)
+MONITORING_PRICES = {
+    "custom_metric_month": 0.30,
+    "dashboard_month": 3.00,
+    "alarm_metric_month": 0.10,
+}
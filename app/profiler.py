@@ -0,0 +1,106 @@
+# profiler.py
+"""
+Instrumentation du générateur Terraform.
+Mesure le temps de rendu, la taille produite et le nombre de substitutions
+de chaque composant, ainsi que la latence d'écriture des fichiers générés.
+Désactivée par défaut: sans --profile ni --stats-json, rien n'est collecté.
+"""
+
+import json
+import sys
+import time
+
+
+def _new_entry():
+    return {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0, "substitutions": 0}
+
+
+def _bump(table, key, elapsed, size, substitutions=0):
+    entry = table.setdefault(key, _new_entry())
+    entry["calls"] += 1
+    entry["seconds"] += elapsed
+    entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+    entry["bytes"] += size
+    entry["substitutions"] += substitutions
+
+
+class GenerationStats:
+    """Aggregate render and write metrics across one or more generator runs."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.components = {}
+        self.files = {}
+        self.writes = {}
+
+    def record_component(self, section, name, elapsed, content, substitutions):
+        """Record the rendering of a single template component."""
+        if not self.enabled:
+            return
+        _bump(self.components, (section, name), elapsed, len(content.encode("utf-8")), substitutions)
+
+    def record_file(self, filename, elapsed, content):
+        """Record the assembly of a whole generated file."""
+        if not self.enabled:
+            return
+        _bump(self.files, filename, elapsed, len(content.encode("utf-8")))
+
+    def record_write(self, file_path, elapsed, size):
+        """Record the latency of writing a generated file to disk."""
+        if not self.enabled:
+            return
+        _bump(self.writes, file_path, elapsed, size)
+
+    def merge(self, stats):
+        """Add the components, files and writes of another run's to_dict() output."""
+        if not self.enabled:
+            return
+        for table, entries, key in ((self.components, stats["components"], lambda e: (e["section"], e["name"])),
+                                    (self.files, stats["files"], lambda e: e["file"]),
+                                    (self.writes, stats["writes"], lambda e: e["path"])):
+            for entry in entries:
+                total = table.setdefault(key(entry), _new_entry())
+                for field in ("calls", "seconds", "bytes", "substitutions"):
+                    total[field] += entry[field]
+                total["max_seconds"] = max(total["max_seconds"], entry["max_seconds"])
+
+    def to_dict(self):
+        """Return the collected metrics as a JSON-serializable dictionary."""
+        return {
+            "total_seconds": time.perf_counter() - self.started_at,
+            "components": [
+                {"section": section, "name": name, **entry}
+                for (section, name), entry in self.components.items()
+            ],
+            "files": [{"file": name, **entry} for name, entry in self.files.items()],
+            "writes": [{"path": path, **entry} for path, entry in self.writes.items()],
+        }
+
+    def report(self):
+        """Return a human readable timing report, slowest components first."""
+        stats = self.to_dict()
+        lines = ["", "Generator profile", "=" * 60]
+        lines.append(f"{'component':<34}{'calls':>6}{'total ms':>10}{'bytes':>10}")
+        for entry in sorted(stats["components"], key=lambda e: e["seconds"], reverse=True):
+            label = f"{entry['section']}:{entry['name']}"
+            lines.append(f"{label:<34}{entry['calls']:>6}{entry['seconds'] * 1000:>10.3f}{entry['bytes']:>10}")
+        substitutions = sum(entry["substitutions"] for entry in stats["components"])
+        lines.append(f"placeholder substitutions: {substitutions}")
+        lines.append("-" * 60)
+        for entry in stats["files"]:
+            lines.append(f"assemble {entry['file']:<25}{entry['calls']:>6}{entry['seconds'] * 1000:>10.3f}{entry['bytes']:>10}")
+        for entry in stats["writes"]:
+            lines.append(f"write {entry['path']}: {entry['seconds'] * 1000:.3f} ms, max {entry['max_seconds'] * 1000:.3f} ms")
+        lines.append("=" * 60)
+        lines.append(f"total: {stats['total_seconds'] * 1000:.3f} ms")
+        return "\n".join(lines)
+
+    def print_report(self, stream=sys.stderr):
+        """Print the timing report, on stderr by default to keep stdout clean."""
+        print(self.report(), file=stream)
+
+    def write_json(self, path):
+        """Dump the collected metrics to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP/JSON du générateur Terraform.
+Les templates restent chargés et précompilés en mémoire entre les requêtes:
+chaque appel à POST /render ne paie que le rendu, fait dans un pool de
+processus pour ne jamais bloquer la boucle asyncio.
+
+POST /render   {"deployment_type": "cost-efficient", "env": {...}, "format": "tar"}
+               -> archive (tar, tar.gz ou zip) contenant main.tf, variables.tf
+                  et terraform.tfvars
+GET  /metrics  -> compteurs et percentiles de latence (JSON)
+GET  /health   -> "ok"
+"""
+
+import io
+import os
+import json
+import time
+import asyncio
+import tarfile
+import zipfile
+import argparse
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app import assemble_terraform_configs, precompile_templates, ENV_FILE_DEFAULT
+from deployment_templates import DEPLOYMENT_TEMPLATES
+from env_parser import read_env_file, build_env_vars, ConfigurationError, BOOL_KEYS, INT_KEYS
+from db_tuning import check_shared_state
+from profiler import GenerationStats
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_MAX_CONCURRENCY = 256
+DEFAULT_WORKERS = os.cpu_count() or 1
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+READ_TIMEOUT = 10
+LATENCY_WINDOW = 10000
+
+# Credentials never leave the server: they are dropped from the base .env and cannot be overridden
+CREDENTIAL_KEYS = frozenset({"AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"})
+# Overrides are limited to the documented .env settings
+OVERRIDE_KEYS = frozenset(key.upper() for key in build_env_vars([])) - CREDENTIAL_KEYS
+# Only the CIDR lists take a list of values
+LIST_OVERRIDE_KEYS = frozenset({"ALLOWED_SSH_IPS", "ALLOWED_HTTP_IPS"})
+# Values are spliced into HCL strings: anything that could close the string or start an interpolation is refused
+FORBIDDEN_VALUE_SEQUENCES = ('"', '\\', '\n', '\r', '${', '%{')
+
+BUNDLE_FORMATS = {
+    "tar": ("application/x-tar", "tar"),
+    "tar.gz": ("application/gzip", "tar.gz"),
+    "zip": ("application/zip", "zip"),
+}
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """Error that maps directly to an HTTP status code."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def build_bundle(configs, bundle_format):
+    """Pack the rendered files into an in-memory tar, tar.gz or zip archive."""
+    buffer = io.BytesIO()
+    mtime = time.time()
+
+    if bundle_format == "zip":
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for filename, content in configs.items():
+                archive.writestr(filename, content)
+    else:
+        options = {"mode": 'w:gz', "compresslevel": 6} if bundle_format == "tar.gz" else {"mode": 'w'}
+        with tarfile.open(fileobj=buffer, **options) as archive:
+            for filename, content in configs.items():
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(filename)
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+
+    return buffer.getvalue()
+
+
+# Base .env values of the current worker process, set by init_worker
+_worker_env_values = []
+
+def init_worker(env_values):
+    """Load the base .env values and compile the templates once per worker process."""
+    global _worker_env_values
+    _worker_env_values = env_values
+    precompile_templates()
+
+def render_bundle(deployment_type, overrides, bundle_format, profile):
+    """Render and pack a bundle in a worker process; returns (bundle, profile stats)."""
+    stats = GenerationStats(enabled=profile)
+    env_vars = build_env_vars(_worker_env_values, overrides)
+    check_shared_state(deployment_type, env_vars)
+    configs = assemble_terraform_configs(deployment_type, env_vars, stats)
+    return build_bundle(configs, bundle_format), stats.to_dict() if profile else None
+
+
+def validate_overrides(overrides):
+    """Check the /render overrides against the whitelist and return them with normalized keys."""
+    validated = {}
+
+    for key, value in overrides.items():
+        name = str(key).strip().upper()
+        if name not in OVERRIDE_KEYS:
+            raise ConfigurationError(f"Override '{key}' is not allowed")
+
+        if name in LIST_OVERRIDE_KEYS:
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ConfigurationError(f"Override '{key}' must be a list of strings")
+            values = value
+        elif isinstance(value, (str, int, bool)):
+            values = [value]
+        else:
+            raise ConfigurationError(f"Override '{key}' must be a string, number or boolean")
+
+        for item in values:
+            if isinstance(item, str) and any(sequence in item for sequence in FORBIDDEN_VALUE_SEQUENCES):
+                raise ConfigurationError(f"Override '{key}' contains a forbidden character or sequence")
+
+        # Same conversions as set_env_value: anything else would be dropped or rendered as invalid HCL
+        text = str(value).strip().strip("'").lower()
+        if name in BOOL_KEYS and not isinstance(value, bool) and text not in ("true", "false"):
+            raise ConfigurationError(f"Override '{key}' must be true or false")
+        if name in INT_KEYS and (isinstance(value, bool) or not text.isdigit()):
+            raise ConfigurationError(f"Override '{key}' must be a non-negative integer")
+
+        validated[name] = value
+
+    return validated
+
+
+class ServerMetrics:
+    """Request counters and a rolling window of request latencies."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.requests = 0
+        self.rendered = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.status_counts = {}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def observe(self, status, elapsed):
+        """Count a finished request and remember its latency."""
+        self.requests += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status >= 500 and status != 503:
+            self.errors += 1
+        self.latencies.append(elapsed)
+
+    def percentile(self, samples, pct):
+        """Return the pct percentile of sorted samples, in milliseconds."""
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index] * 1000
+
+    def to_dict(self):
+        samples = sorted(self.latencies)
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "requests": self.requests,
+            "rendered": self.rendered,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "status": {str(code): count for code, count in self.status_counts.items()},
+            "latency_ms": {
+                "p50": self.percentile(samples, 50),
+                "p95": self.percentile(samples, 95),
+                "p99": self.percentile(samples, 99),
+                "max": samples[-1] * 1000 if samples else 0.0,
+                "window": len(samples),
+            },
+        }
+
+
+class GeneratorServer:
+    """asyncio HTTP server rendering Terraform bundles from warm templates."""
+
+    def __init__(self, env_file, max_concurrency=DEFAULT_MAX_CONCURRENCY, profile=False, workers=DEFAULT_WORKERS):
+        self.env_values = [(key, value) for key, value in read_env_file(env_file)
+                           if key.upper() not in CREDENTIAL_KEYS]
+        self.max_concurrency = max_concurrency
+        self.workers = workers
+        self.metrics = ServerMetrics()
+        self.stats = GenerationStats(enabled=profile)
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.pool = None
+
+    async def render(self, payload):
+        """Render a bundle for a decoded /render payload."""
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Payload must be a JSON object")
+
+        deployment_type = payload.get("deployment_type") or payload.get("type")
+        if not isinstance(deployment_type, str) or deployment_type not in DEPLOYMENT_TEMPLATES:
+            raise HttpError(400, f"Unknown deployment type '{deployment_type}'")
+
+        overrides = payload.get("env") or payload.get("overrides") or {}
+        if not isinstance(overrides, dict):
+            raise HttpError(400, "'env' must be a JSON object")
+        try:
+            overrides = validate_overrides(overrides)
+        except ConfigurationError as e:
+            raise HttpError(400, str(e))
+
+        bundle_format = payload.get("format", "tar")
+        if not isinstance(bundle_format, str) or bundle_format not in BUNDLE_FORMATS:
+            raise HttpError(400, f"Unknown bundle format '{bundle_format}'")
+
+        # Admission happens before any rendering: past the limit, answer 503 right away
+        if self.slots.locked():
+            self.metrics.rejected += 1
+            raise HttpError(503, "Server busy", {"Retry-After": "1"})
+
+        async with self.slots:
+            self.metrics.in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                data, stats = await loop.run_in_executor(
+                    self.pool, render_bundle, deployment_type, overrides, bundle_format, self.stats.enabled)
+            except ConfigurationError as e:
+                raise HttpError(400, str(e))
+            finally:
+                self.metrics.in_flight -= 1
+
+        if stats:
+            self.stats.merge(stats)
+        content_type, extension = BUNDLE_FORMATS[bundle_format]
+        filename = f"terraform-{deployment_type}.{extension}"
+
+        return content_type, data, {
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+
+    async def route(self, method, path, body):
+        """Dispatch a request and return (status, content_type, body, extra headers)."""
+        path = path.split('?', 1)[0]
+
+        if path == "/health":
+            return 200, "text/plain", b"ok", {}
+
+        if path == "/metrics":
+            metrics = self.metrics.to_dict()
+            if self.stats.enabled:
+                metrics["generator"] = self.stats.to_dict()
+            return 200, "application/json", json.dumps(metrics).encode("utf-8"), {}
+
+        if path == "/render":
+            if method != "POST":
+                raise HttpError(405, "Use POST /render")
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError as e:
+                raise HttpError(400, f"Invalid JSON payload: {e}")
+            content_type, data, headers = await self.render(payload)
+            self.metrics.rendered += 1
+            return 200, content_type, data, headers
+
+        raise HttpError(404, f"No route for {path}")
+
+    async def read_request(self, reader):
+        """Read one HTTP/1.x request. Returns None when the client closed the connection."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), READ_TIMEOUT)
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Request headers too large")
+
+        received_at = time.perf_counter()
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, f"Request body larger than {MAX_BODY_SIZE} bytes")
+
+        body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT) if length else b""
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return method.upper(), path, body, keep_alive, received_at
+
+    def write_response(self, writer, status, content_type, body, headers, keep_alive):
+        """Queue an HTTP/1.1 response on the connection."""
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on a (keep-alive) connection until it closes."""
+        keep_alive = True
+        # The first request is timed from accept; later keep-alive requests from the
+        # arrival of their headers (the loop never blocks on rendering, so this is
+        # when the bytes were available).
+        accepted_at = time.perf_counter()
+        try:
+            while keep_alive:
+                try:
+                    request = await self.read_request(reader)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    self.write_response(writer, e.status, "application/json",
+                                        json.dumps({"error": e.message}).encode("utf-8"), {}, False)
+                    self.metrics.observe(e.status, 0.0)
+                    break
+                if request is None:
+                    break
+
+                method, path, body, keep_alive, received_at = request
+                start = accepted_at if accepted_at is not None else received_at
+                accepted_at = None
+
+                try:
+                    status, content_type, data, headers = await self.route(method, path, body)
+                except HttpError as e:
+                    status, content_type, data, headers = e.status, "application/json", json.dumps({"error": e.message}).encode("utf-8"), e.headers
+                except Exception as e:
+                    print(f"Error: request {method} {path} failed: {e}")
+                    traceback.print_exc()
+                    status, content_type, data, headers = 500, "application/json", b'{"error": "Internal error"}', {}
+
+                self.write_response(writer, status, content_type, data, headers, keep_alive)
+                await writer.drain()
+                self.metrics.observe(status, time.perf_counter() - start)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """Listen on host:port until cancelled."""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                        initargs=(self.env_values,))
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_SIZE, backlog=1024)
+        print(f"Terraform generator listening on http://{host}:{port} "
+              f"(max concurrency {self.max_concurrency}, {self.workers} render workers)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def parse_command_line_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Serve rendered WordPress Terraform bundles over HTTP.')
+    parser.add_argument('--env', '-e', default=ENV_FILE_DEFAULT, help=f'Path to the base .env file (default: {ENV_FILE_DEFAULT})')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Listen address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT, help=f'Listen port (default: {DEFAULT_PORT})')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help=f'Requests in flight before answering 503 (default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f'Render worker processes (default: {DEFAULT_WORKERS}, one per CPU)')
+    parser.add_argument('--profile', action='store_true', help='Include per-component render metrics in /metrics')
+    return parser.parse_args()
+
+def main():
+    """Main function to run the server."""
+    args = parse_command_line_args()
+
+    async def run():
+        server = GeneratorServer(args.env, args.max_concurrency, args.profile, args.workers)
+        await server.serve(args.host, args.port)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -61,6 +61,57 @@ resource "aws_security_group" "ec2-sg" {
 """,
 
 
+    "security_group_rds": """
+# Security Group for RDS: MariaDB is only reachable from the WordPress instances
+resource "aws_security_group" "rds-sg" {
+  count       = var.use_rds ? 1 : 0
+  name        = "{project_name}-rds-sg"
+  description = "MariaDB access from the WordPress instances"
+  vpc_id      = aws_vpc.wordpress_vpc.id
+  
+  ingress {
+    from_port       = 3306
+    to_port         = 3306
+    protocol        = "tcp"
+    security_groups = [aws_security_group.ec2-sg.id]
+  }
+}
+""",
+
+    "rds_instance": """
+# Shared MariaDB database on RDS, in the subnets of every Availability Zone
+resource "aws_db_subnet_group" "wordpress" {
+  count      = var.use_rds ? 1 : 0
+  name       = "{project_name}-db-subnets"
+  subnet_ids = local.wordpress_subnet_ids
+}
+
+resource "aws_db_instance" "wordpress" {
+  count                     = var.use_rds ? 1 : 0
+  identifier                = "{project_name}-db"
+  engine                    = "mariadb"
+  instance_class            = var.rds_instance_class
+  allocated_storage         = var.rds_storage_size
+  storage_type              = "gp2"
+  storage_encrypted         = true
+  multi_az                  = var.rds_multi_az
+  db_name                   = var.wordpress_db_name
+  username                  = var.wordpress_db_user
+  password                  = var.wordpress_db_password
+  db_subnet_group_name      = aws_db_subnet_group.wordpress[0].name
+  vpc_security_group_ids    = [aws_security_group.rds-sg[0].id]
+  publicly_accessible       = false
+  backup_retention_period   = 7
+  skip_final_snapshot       = false
+  final_snapshot_identifier = "{project_name}-db-final"
+  
+  tags = {
+    Name = "{project_name}-db"
+    Environment = "{environment}"
+  }
+}
+""",
+
     "security_group_lb": """
 # Security Group for Load Balancer
 resource "aws_security_group" "lb-sg" {
@@ -94,6 +145,7 @@ resource "aws_instance" "wordpress" {
   key_name               = var.ssh_key_name
   vpc_security_group_ids = [aws_security_group.ec2-sg.id]
   subnet_id              = aws_subnet.public_subnet.id
+  iam_instance_profile   = aws_iam_instance_profile.wordpress.name
   
   root_block_device {
     volume_size = var.instance_volume_size
@@ -110,10 +162,30 @@ resource "aws_instance" "wordpress" {
     WORDPRESS_ADMIN_EMAIL = var.wordpress_admin_email,
     WORDPRESS_INSTALL_PATH = "/var/www/html",
     WORDPRESS_DOMAIN = "",
-    KEYS_LINE_NUM = "",
-    NONCE_SALT_LINE_NUM = "",
-    KEYS = ""
+    DB_HOST = "",
+    AWS_REGION = var.aws_region,
+    AUTO_SCALING_GROUP_NAME = "",
+    LIFECYCLE_HOOK_NAME = "",
+    ENABLE_MONITORING = var.enable_monitoring,
+    CLOUDWATCH_AGENT_CONFIG_PARAMETER = var.enable_monitoring ? aws_ssm_parameter.cloudwatch_agent_config[0].name : "",
+    ENABLE_WEB_PERFORMANCE = var.enable_web_performance,
+    STATIC_ASSET_MAX_AGE = var.static_asset_max_age_days * 86400,
+    ENABLE_EFS = var.enable_efs,
+    EFS_FILE_SYSTEM_ID = var.enable_efs ? aws_efs_file_system.wordpress_uploads[0].id : "",
+    EFS_ATTRIBUTE_CACHE_SECONDS = var.efs_attribute_cache_seconds,
+    DB_INNODB_BUFFER_POOL_MB = {db_innodb_buffer_pool_mb},
+    DB_INNODB_LOG_FILE_MB = {db_innodb_log_file_mb},
+    DB_MAX_CONNECTIONS = {db_max_connections},
+    DB_TMP_TABLE_MB = {db_tmp_table_mb},
+    DB_PERFORMANCE_SCHEMA = "{db_performance_schema}",
+    PHP_FPM_MAX_CHILDREN = {php_fpm_max_children},
+    PHP_FPM_START_SERVERS = {php_fpm_start_servers},
+    PHP_FPM_MIN_SPARE_SERVERS = {php_fpm_min_spare_servers},
+    PHP_FPM_MAX_SPARE_SERVERS = {php_fpm_max_spare_servers}
   })
+
+  # The uploads file system must be reachable from the instance's subnet at boot
+  depends_on = [aws_efs_mount_target.wordpress_uploads]
   }
 """,
     
@@ -124,7 +196,308 @@ resource "aws_lb" "wordpress_lb" {
   internal           = false
   load_balancer_type = "application"
   security_groups    = [aws_security_group.lb-sg.id]
-  subnets              = [aws_subnet.public_subnet.id]
+  subnets              = local.wordpress_subnet_ids
+}
+""",
+
+    "target_group": """
+# Target Group and HTTP listener for the WordPress instances
+resource "aws_lb_target_group" "wordpress" {
+  name                 = "{project_name}-tg"
+  port                 = 80
+  protocol             = "HTTP"
+  vpc_id               = aws_vpc.wordpress_vpc.id
+  deregistration_delay = 30
+  
+  health_check {
+    path                = "/"
+    matcher             = "200-399"
+    interval            = 15
+    healthy_threshold   = 2
+    unhealthy_threshold = 3
+  }
+}
+
+resource "aws_lb_listener" "http" {
+  load_balancer_arn = aws_lb.wordpress_lb.arn
+  port              = 80
+  protocol          = "HTTP"
+  
+  default_action {
+    type             = "forward"
+    target_group_arn = aws_lb_target_group.wordpress.arn
+  }
+}
+""",
+
+    "launch_template": """
+# Launch Template for the WordPress Auto Scaling group
+resource "aws_launch_template" "wordpress" {
+  name_prefix            = "{project_name}-wordpress-"
+  image_id               = var.instance_ami
+  instance_type          = var.instance_type
+  key_name               = var.ssh_key_name
+  vpc_security_group_ids = [aws_security_group.ec2-sg.id]
+  
+  iam_instance_profile {
+    name = aws_iam_instance_profile.wordpress.name
+  }
+  
+  # 1-minute EC2 metrics: the cpu_high alarm evaluates 60 s periods
+  monitoring {
+    enabled = true
+  }
+  
+  block_device_mappings {
+    device_name = "/dev/xvda"
+    
+    ebs {
+      volume_size = var.instance_volume_size
+      volume_type = "gp3"
+    }
+  }
+  
+  tag_specifications {
+    resource_type = "instance"
+    
+    tags = {
+      Name = "{project_name}-wordpress"
+      Environment = "{environment}"
+    }
+  }
+  
+  user_data = base64encode(templatefile("./../wordpress-install/user_data.sh.tpl", {
+    WORDPRESS_DB_NAME = var.wordpress_db_name,
+    WORDPRESS_DB_USER = var.wordpress_db_user,
+    WORDPRESS_DB_PASSWORD = var.wordpress_db_password,
+    WORDPRESS_SITE_TITLE = var.wordpress_site_title,
+    WORDPRESS_ADMIN_USER = var.wordpress_admin_user,
+    WORDPRESS_ADMIN_PASSWORD = var.wordpress_admin_password,
+    WORDPRESS_ADMIN_EMAIL = var.wordpress_admin_email,
+    WORDPRESS_INSTALL_PATH = "/var/www/html",
+    WORDPRESS_DOMAIN = aws_lb.wordpress_lb.dns_name,
+    DB_HOST = var.use_rds ? aws_db_instance.wordpress[0].address : "",
+    AWS_REGION = var.aws_region,
+    AUTO_SCALING_GROUP_NAME = "{project_name}-asg",
+    LIFECYCLE_HOOK_NAME = var.enable_warm_pool ? "{project_name}-launching" : "",
+    ENABLE_MONITORING = var.enable_monitoring,
+    CLOUDWATCH_AGENT_CONFIG_PARAMETER = var.enable_monitoring ? aws_ssm_parameter.cloudwatch_agent_config[0].name : "",
+    ENABLE_WEB_PERFORMANCE = var.enable_web_performance,
+    STATIC_ASSET_MAX_AGE = var.static_asset_max_age_days * 86400,
+    ENABLE_EFS = var.enable_efs,
+    EFS_FILE_SYSTEM_ID = var.enable_efs ? aws_efs_file_system.wordpress_uploads[0].id : "",
+    EFS_ATTRIBUTE_CACHE_SECONDS = var.efs_attribute_cache_seconds,
+    DB_INNODB_BUFFER_POOL_MB = {db_innodb_buffer_pool_mb},
+    DB_INNODB_LOG_FILE_MB = {db_innodb_log_file_mb},
+    DB_MAX_CONNECTIONS = {db_max_connections},
+    DB_TMP_TABLE_MB = {db_tmp_table_mb},
+    DB_PERFORMANCE_SCHEMA = "{db_performance_schema}",
+    PHP_FPM_MAX_CHILDREN = {php_fpm_max_children},
+    PHP_FPM_START_SERVERS = {php_fpm_start_servers},
+    PHP_FPM_MIN_SPARE_SERVERS = {php_fpm_min_spare_servers},
+    PHP_FPM_MAX_SPARE_SERVERS = {php_fpm_max_spare_servers}
+  }))
+  
+  # The uploads file system must be reachable from the instance's subnet at boot
+  depends_on = [aws_efs_mount_target.wordpress_uploads]
+}
+""",
+
+    "auto_scaling_group": """
+# Auto Scaling group spread over the public subnets of each Availability Zone
+resource "aws_autoscaling_group" "wordpress" {
+  name                      = "{project_name}-asg"
+  min_size                  = var.min_instances
+  max_size                  = var.max_instances
+  vpc_zone_identifier       = local.wordpress_subnet_ids
+  target_group_arns         = [aws_lb_target_group.wordpress.arn]
+  health_check_type         = "ELB"
+  health_check_grace_period = 300
+  default_instance_warmup   = 180
+  
+  launch_template {
+    id      = aws_launch_template.wordpress.id
+    version = aws_launch_template.wordpress.latest_version
+  }
+  
+  # Stopped, already provisioned instances: scaling out only needs a start, not a full install
+  dynamic "warm_pool" {
+    for_each = var.enable_warm_pool ? [1] : []
+    content {
+      pool_state                  = "Stopped"
+      min_size                    = var.warm_pool_min_size
+      max_group_prepared_capacity = var.warm_pool_max_prepared_capacity > 0 ? var.warm_pool_max_prepared_capacity : null
+      
+      instance_reuse_policy {
+        reuse_on_scale_in = true
+      }
+    }
+  }
+  
+  # Keeps the instance out of service (or out of the stopped pool) until user_data has finished
+  dynamic "initial_lifecycle_hook" {
+    for_each = var.enable_warm_pool ? [1] : []
+    content {
+      name                 = "{project_name}-launching"
+      lifecycle_transition = "autoscaling:EC2_INSTANCE_LAUNCHING"
+      default_result       = "ABANDON"
+      heartbeat_timeout    = 1200
+    }
+  }
+  
+  tag {
+    key                 = "Environment"
+    value               = "{environment}"
+    propagate_at_launch = true
+  }
+  
+  # Desired capacity belongs to the scaling policies and scheduled actions
+  lifecycle {
+    ignore_changes = [desired_capacity]
+    
+    # Cross-variable check: variable validations can only reference other variables from Terraform 1.9
+    precondition {
+      condition     = var.max_instances >= var.min_instances
+      error_message = "max_instances must be greater than or equal to min_instances."
+    }
+  }
+  
+  # The first instances complete the lifecycle hook as soon as user_data has finished
+  depends_on = [aws_iam_role_policy.complete_lifecycle_action]
+}
+
+data "aws_caller_identity" "current" {}
+
+# Let the instances complete the launch lifecycle hook. The ARN is built from the group name:
+# the permission must exist before the group launches its first instances
+resource "aws_iam_role_policy" "complete_lifecycle_action" {
+  count = var.enable_warm_pool ? 1 : 0
+  name  = "complete-lifecycle-action"
+  role  = aws_iam_role.wordpress.id
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect   = "Allow"
+      Action   = "autoscaling:CompleteLifecycleAction"
+      Resource = "arn:aws:autoscaling:${var.aws_region}:${data.aws_caller_identity.current.account_id}:autoScalingGroup:*:autoScalingGroupName/{project_name}-asg"
+    }]
+  })
+}
+
+# CPU driven scaling (the PHP-FPM queue alarm below also triggers scale_up)
+resource "aws_autoscaling_policy" "scale_up" {
+  count                  = var.enable_auto_scaling ? 1 : 0
+  name                   = "{project_name}-scale-up"
+  autoscaling_group_name = aws_autoscaling_group.wordpress.name
+  adjustment_type        = "ChangeInCapacity"
+  scaling_adjustment     = 1
+  cooldown               = 180
+}
+
+resource "aws_cloudwatch_metric_alarm" "cpu_high" {
+  count               = var.enable_auto_scaling ? 1 : 0
+  alarm_name          = "{project_name}-cpu-high"
+  namespace           = "AWS/EC2"
+  metric_name         = "CPUUtilization"
+  statistic           = "Average"
+  period              = 60
+  evaluation_periods  = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.scale_up_cpu_threshold
+  dimensions          = { AutoScalingGroupName = aws_autoscaling_group.wordpress.name }
+  alarm_actions       = [aws_autoscaling_policy.scale_up[0].arn]
+}
+
+resource "aws_autoscaling_policy" "scale_down" {
+  count                  = var.enable_auto_scaling ? 1 : 0
+  name                   = "{project_name}-scale-down"
+  autoscaling_group_name = aws_autoscaling_group.wordpress.name
+  adjustment_type        = "ChangeInCapacity"
+  scaling_adjustment     = -1
+  cooldown               = 300
+}
+
+resource "aws_cloudwatch_metric_alarm" "cpu_low" {
+  count               = var.enable_auto_scaling ? 1 : 0
+  alarm_name          = "{project_name}-cpu-low"
+  namespace           = "AWS/EC2"
+  metric_name         = "CPUUtilization"
+  statistic           = "Average"
+  period              = 300
+  evaluation_periods  = 3
+  comparison_operator = "LessThanThreshold"
+  threshold           = var.scale_down_cpu_threshold
+  dimensions          = { AutoScalingGroupName = aws_autoscaling_group.wordpress.name }
+  alarm_actions       = [aws_autoscaling_policy.scale_down[0].arn]
+}
+
+# Request driven scaling: keeps the load balancer requests per instance around the target
+resource "aws_autoscaling_policy" "requests_per_target" {
+  count                  = var.enable_auto_scaling && var.scale_requests_per_target > 0 ? 1 : 0
+  name                   = "{project_name}-requests-per-target"
+  autoscaling_group_name = aws_autoscaling_group.wordpress.name
+  policy_type            = "TargetTrackingScaling"
+  
+  target_tracking_configuration {
+    target_value = var.scale_requests_per_target
+    
+    predefined_metric_specification {
+      predefined_metric_type = "ALBRequestCountPerTarget"
+      resource_label         = "${aws_lb.wordpress_lb.arn_suffix}/${aws_lb_target_group.wordpress.arn_suffix}"
+    }
+  }
+}
+
+# Requests queuing for a PHP-FPM worker across the group: add an instance before latency climbs
+resource "aws_cloudwatch_metric_alarm" "php_fpm_queue_scale_up" {
+  count               = var.enable_auto_scaling && var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-php-fpm-queue-scale-up"
+  namespace           = "{project_name}/WordPress"
+  metric_name         = "php_fpm_listen_queue"
+  statistic           = "Average"
+  period              = 60
+  evaluation_periods  = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = 0
+  treat_missing_data  = "notBreaching"
+  dimensions          = { AutoScalingGroupName = aws_autoscaling_group.wordpress.name }
+  alarm_actions       = [aws_autoscaling_policy.scale_up[0].arn]
+}
+
+# Scheduled capacity changes for known traffic peaks (SCALING_SCHEDULES in .env)
+resource "aws_autoscaling_schedule" "wordpress" {
+  for_each               = { for schedule in var.scaling_schedules : schedule.name => schedule }
+  scheduled_action_name  = each.key
+  autoscaling_group_name = aws_autoscaling_group.wordpress.name
+  recurrence             = each.value.recurrence
+  time_zone              = var.scaling_schedule_time_zone
+  min_size               = each.value.min_size
+  max_size               = each.value.max_size
+  desired_capacity       = each.value.desired_capacity
+}
+""",
+
+    "predictive_scaling": """
+# Predictive scaling: launches capacity ahead of the daily and weekly peaks learned from CPU history
+resource "aws_autoscaling_policy" "predictive" {
+  count                  = var.enable_predictive_scaling ? 1 : 0
+  name                   = "{project_name}-predictive"
+  autoscaling_group_name = aws_autoscaling_group.wordpress.name
+  policy_type            = "PredictiveScaling"
+  
+  predictive_scaling_configuration {
+    mode                   = var.predictive_scaling_mode
+    scheduling_buffer_time = var.predictive_scaling_buffer_seconds
+    
+    metric_specification {
+      target_value = var.predictive_scaling_cpu_target
+      
+      predefined_metric_pair_specification {
+        predefined_metric_type = "ASGCPUUtilization"
+      }
+    }
+  }
 }
 """,
 
@@ -171,8 +544,120 @@ resource "aws_internet_gateway" "wordpress_igw" {
     Environment = "dev"
   }
 }
+
+locals {
+  wordpress_subnet_ids = [aws_subnet.public_subnet.id]
+}
 """,
 
+    "subnet_multi_az": """
+# Public Subnets, one per Availability Zone
+data "aws_availability_zones" "available" {
+  state = "available"
+}
+
+resource "aws_subnet" "public_subnet_az" {
+  count                   = var.availability_zone_count
+  vpc_id                  = aws_vpc.wordpress_vpc.id
+  cidr_block              = cidrsubnet(var.vpc_cidr, 8, count.index + 10)
+  availability_zone       = data.aws_availability_zones.available.names[count.index]
+  map_public_ip_on_launch = true
+  
+  tags = {
+    Name = "{project_name}-public-subnet-${count.index + 1}"
+    Environment = "{environment}"
+  }
+}
+
+# Route Table for Public Subnets
+resource "aws_route_table" "public_route_table" {
+  vpc_id = aws_vpc.wordpress_vpc.id
+  
+  route {
+    cidr_block = "0.0.0.0/0"
+    gateway_id = aws_internet_gateway.wordpress_igw.id
+  }
+  
+  tags = {
+    Name = "{project_name}-public-rt"
+    Environment = "{environment}"
+  }
+}
+
+# Route Table Associations for Public Subnets
+resource "aws_route_table_association" "public_rta" {
+  count          = var.availability_zone_count
+  subnet_id      = aws_subnet.public_subnet_az[count.index].id
+  route_table_id = aws_route_table.public_route_table.id
+}
+
+resource "aws_internet_gateway" "wordpress_igw" {
+  vpc_id = aws_vpc.wordpress_vpc.id
+  
+  tags = {
+    Name = "{project_name}-igw"
+    Environment = "{environment}"
+  }
+}
+
+locals {
+  wordpress_subnet_ids = aws_subnet.public_subnet_az[*].id
+}
+""",
+
+    "efs": """
+# Shared file system for wp-content/uploads, so every instance serves the same media
+resource "aws_efs_file_system" "wordpress_uploads" {
+  count                           = var.enable_efs ? 1 : 0
+  creation_token                  = "{project_name}-uploads"
+  encrypted                       = true
+  performance_mode                = "generalPurpose"
+  throughput_mode                 = var.efs_throughput_mode
+  provisioned_throughput_in_mibps = var.efs_throughput_mode == "provisioned" ? var.efs_provisioned_throughput_mibps : null
+  
+  lifecycle_policy {
+    transition_to_ia = "AFTER_30_DAYS"
+  }
+  
+  tags = {
+    Name = "{project_name}-uploads"
+    Environment = "{environment}"
+  }
+}
+
+# Security Group for EFS: NFS from the WordPress instances only
+resource "aws_security_group" "efs-sg" {
+  count       = var.enable_efs ? 1 : 0
+  name        = "efs-sg"
+  description = "Security group for EFS"
+  vpc_id      = aws_vpc.wordpress_vpc.id
+  
+  ingress {
+    from_port       = 2049
+    to_port         = 2049
+    protocol        = "tcp"
+    security_groups = [aws_security_group.ec2-sg.id]
+  }
+  
+  # Outbound traffic
+  egress {
+    from_port   = 0
+    to_port     = 0
+    protocol    = "-1"
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+}
+
+# One mount target per Availability Zone used by the instances
+resource "aws_efs_mount_target" "wordpress_uploads" {
+  count           = var.enable_efs ? length(local.wordpress_subnet_ids) : 0
+  file_system_id  = aws_efs_file_system.wordpress_uploads[0].id
+  subnet_id       = local.wordpress_subnet_ids[count.index]
+  security_groups = [aws_security_group.efs-sg[0].id]
+}
+""",
+
+
 "private_subnet": """
 # Private Subnet
 resource "aws_subnet" "private_subnet" {
@@ -228,4 +713,352 @@ resource "aws_route_table_association" "private_rta" {
 }
 
 """,
+
+    "instance_role": """
+# IAM role of the WordPress instances (permissions are attached by the optional components)
+resource "aws_iam_role" "wordpress" {
+  name = "{project_name}-wordpress-instance"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect    = "Allow"
+      Principal = { Service = "ec2.amazonaws.com" }
+      Action    = "sts:AssumeRole"
+    }]
+  })
+}
+
+resource "aws_iam_instance_profile" "wordpress" {
+  name = "{project_name}-wordpress-instance"
+  role = aws_iam_role.wordpress.name
+}
+""",
+
+    "monitoring": """
+# Allow the CloudWatch agent to publish metrics and logs
+resource "aws_iam_role_policy_attachment" "cloudwatch_agent" {
+  count      = var.enable_monitoring ? 1 : 0
+  role       = aws_iam_role.wordpress.name
+  policy_arn = "arn:aws:iam::aws:policy/CloudWatchAgentServerPolicy"
+}
+
+# CloudWatch agent configuration, fetched by the instances at boot
+# (the AmazonCloudWatch- prefix is readable with CloudWatchAgentServerPolicy)
+resource "aws_ssm_parameter" "cloudwatch_agent_config" {
+  count = var.enable_monitoring ? 1 : 0
+  name  = "AmazonCloudWatch-{project_name}-wordpress"
+  type  = "String"
+
+  value = jsonencode({
+    agent = {
+      metrics_collection_interval = 60
+    }
+    metrics = {
+      namespace = "{project_name}/WordPress"
+      append_dimensions = {
+        InstanceId           = "$${aws:InstanceId}"
+        AutoScalingGroupName = "$${aws:AutoScalingGroupName}"
+      }
+      aggregation_dimensions = [["InstanceId"], ["AutoScalingGroupName"]]
+      metrics_collected = {
+        mem = {
+          measurement = ["mem_used_percent", "mem_available"]
+        }
+        swap = {
+          measurement = ["swap_used_percent"]
+        }
+        disk = {
+          measurement = ["used_percent"]
+          resources   = ["/"]
+        }
+        statsd = {
+          service_address              = "127.0.0.1:8125"
+          metrics_collection_interval  = 60
+          metrics_aggregation_interval = 60
+        }
+      }
+    }
+    logs = {
+      logs_collected = {
+        files = {
+          collect_list = [
+            {
+              file_path       = "/var/log/httpd/wordpress-access.log"
+              log_group_name  = aws_cloudwatch_log_group.wordpress["apache-access"].name
+              log_stream_name = "{instance_id}"
+            },
+            {
+              file_path       = "/var/log/httpd/wordpress-error.log"
+              log_group_name  = aws_cloudwatch_log_group.wordpress["apache-error"].name
+              log_stream_name = "{instance_id}"
+            },
+            {
+              file_path       = "/var/log/php-fpm/www-error.log"
+              log_group_name  = aws_cloudwatch_log_group.wordpress["php-fpm"].name
+              log_stream_name = "{instance_id}"
+            },
+            {
+              file_path        = "/var/log/mariadb/slow.log"
+              log_group_name   = aws_cloudwatch_log_group.wordpress["mariadb-slow"].name
+              log_stream_name  = "{instance_id}"
+              multi_line_start_pattern = "^# Time:"
+            },
+          ]
+        }
+      }
+    }
+  })
+}
+
+resource "aws_cloudwatch_log_group" "wordpress" {
+  for_each          = var.enable_monitoring ? toset(["apache-access", "apache-error", "php-fpm", "mariadb-slow"]) : toset([])
+  name              = "/{project_name}/wordpress/${each.key}"
+  retention_in_days = var.log_retention_days
+}
+
+# Slow queries counted from the MariaDB slow log
+resource "aws_cloudwatch_log_metric_filter" "mariadb_slow_queries" {
+  count          = var.enable_monitoring ? 1 : 0
+  name           = "{project_name}-mariadb-slow-queries"
+  log_group_name = aws_cloudwatch_log_group.wordpress["mariadb-slow"].name
+  pattern        = "\\"# Query_time\\""
+
+  metric_transformation {
+    name      = "mariadb_slow_queries"
+    namespace = "{project_name}/WordPress"
+    value     = "1"
+  }
+}
+
+resource "aws_sns_topic" "alarms" {
+  count = var.enable_monitoring ? 1 : 0
+  name  = "{project_name}-alarms"
+}
+
+resource "aws_sns_topic_subscription" "alarms_email" {
+  count     = var.enable_monitoring && var.alarm_email != "" ? 1 : 0
+  topic_arn = aws_sns_topic.alarms[0].arn
+  protocol  = "email"
+  endpoint  = var.alarm_email
+}
+
+resource "aws_cloudwatch_dashboard" "wordpress" {
+  count          = var.enable_monitoring ? 1 : 0
+  dashboard_name = "{project_name}-wordpress"
+
+  dashboard_body = jsonencode({
+    widgets = [
+      for index, widget in [
+        { title = "CPU utilization (%)", expression = "SEARCH('{AWS/EC2,InstanceId} MetricName=\\"CPUUtilization\\"', 'Average', 60)" },
+        { title = "Memory used (%)", expression = "SEARCH('{\\"{project_name}/WordPress\\",InstanceId} MetricName=\\"mem_used_percent\\"', 'Average', 60)" },
+        { title = "Root disk used (%)", expression = "SEARCH('{\\"{project_name}/WordPress\\",InstanceId} MetricName=\\"disk_used_percent\\"', 'Average', 300)" },
+        { title = "Apache busy workers", expression = "SEARCH('{\\"{project_name}/WordPress\\",InstanceId} MetricName=\\"apache_busy_workers\\"', 'Average', 60)" },
+        { title = "PHP-FPM active processes", expression = "SEARCH('{\\"{project_name}/WordPress\\",InstanceId} MetricName=\\"php_fpm_active_processes\\"', 'Average', 60)" },
+        { title = "PHP-FPM listen queue", expression = "SEARCH('{\\"{project_name}/WordPress\\",InstanceId} MetricName=\\"php_fpm_listen_queue\\"', 'Maximum', 60)" },
+        { title = "MariaDB slow queries", expression = "SEARCH('{\\"{project_name}/WordPress\\"} MetricName=\\"mariadb_slow_queries\\"', 'Sum', 300)" },
+      ] : {
+        type   = "metric"
+        x      = (index % 3) * 8
+        y      = floor(index / 3) * 6
+        width  = 8
+        height = 6
+        properties = {
+          title   = widget.title
+          region  = var.aws_region
+          view    = "timeSeries"
+          metrics = [[{ expression = widget.expression, id = "e${index}" }]]
+        }
+      }
+    ]
+  })
+}
+""",
+
+    "monitoring_instance_alarms": """
+# Alarms on the single WordPress instance
+resource "aws_cloudwatch_metric_alarm" "instance_memory" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-memory-high"
+  alarm_description   = "Memory used above ${var.alarm_memory_used_percent}% on the WordPress instance"
+  namespace           = "{project_name}/WordPress"
+  metric_name         = "mem_used_percent"
+  dimensions          = { InstanceId = aws_instance.wordpress.id }
+  statistic           = "Average"
+  period              = 60
+  evaluation_periods  = 5
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.alarm_memory_used_percent
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+  ok_actions          = [aws_sns_topic.alarms[0].arn]
+}
+
+resource "aws_cloudwatch_metric_alarm" "instance_disk" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-disk-high"
+  alarm_description   = "Root volume above ${var.alarm_disk_used_percent}% on the WordPress instance"
+  namespace           = "{project_name}/WordPress"
+  metric_name         = "disk_used_percent"
+  dimensions          = { InstanceId = aws_instance.wordpress.id }
+  statistic           = "Average"
+  period              = 300
+  evaluation_periods  = 1
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.alarm_disk_used_percent
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+}
+
+resource "aws_cloudwatch_metric_alarm" "instance_php_fpm_queue" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-php-fpm-saturated"
+  alarm_description   = "Requests are queuing for a PHP-FPM worker"
+  namespace           = "{project_name}/WordPress"
+  metric_name         = "php_fpm_listen_queue"
+  dimensions          = { InstanceId = aws_instance.wordpress.id }
+  statistic           = "Maximum"
+  period              = 60
+  evaluation_periods  = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = 0
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+}
+""",
+
+    "monitoring_alb": """
+# Load balancer latency and error alarms
+resource "aws_cloudwatch_metric_alarm" "alb_latency_p95" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-latency-p95"
+  alarm_description   = "p95 target response time above ${var.alarm_latency_p95_ms} ms"
+  namespace           = "AWS/ApplicationELB"
+  metric_name         = "TargetResponseTime"
+  dimensions          = { LoadBalancer = aws_lb.wordpress_lb.arn_suffix }
+  extended_statistic  = "p95"
+  period              = 60
+  evaluation_periods  = 5
+  datapoints_to_alarm = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.alarm_latency_p95_ms / 1000
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+  ok_actions          = [aws_sns_topic.alarms[0].arn]
+}
+
+resource "aws_cloudwatch_metric_alarm" "alb_latency_p99" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-latency-p99"
+  alarm_description   = "p99 target response time above ${var.alarm_latency_p99_ms} ms"
+  namespace           = "AWS/ApplicationELB"
+  metric_name         = "TargetResponseTime"
+  dimensions          = { LoadBalancer = aws_lb.wordpress_lb.arn_suffix }
+  extended_statistic  = "p99"
+  period              = 60
+  evaluation_periods  = 5
+  datapoints_to_alarm = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.alarm_latency_p99_ms / 1000
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+  ok_actions          = [aws_sns_topic.alarms[0].arn]
+}
+
+resource "aws_cloudwatch_metric_alarm" "alb_5xx" {
+  count               = var.enable_monitoring ? 1 : 0
+  alarm_name          = "{project_name}-5xx"
+  alarm_description   = "More than ${var.alarm_5xx_count} 5xx responses per minute (targets and load balancer)"
+  evaluation_periods  = 3
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = var.alarm_5xx_count
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = [aws_sns_topic.alarms[0].arn]
+  ok_actions          = [aws_sns_topic.alarms[0].arn]
+
+  metric_query {
+    id          = "errors"
+    expression  = "FILL(target, 0) + FILL(elb, 0)"
+    label       = "5xx responses"
+    return_data = true
+  }
+
+  metric_query {
+    id = "target"
+    metric {
+      namespace   = "AWS/ApplicationELB"
+      metric_name = "HTTPCode_Target_5XX_Count"
+      dimensions  = { LoadBalancer = aws_lb.wordpress_lb.arn_suffix }
+      stat        = "Sum"
+      period      = 60
+    }
+  }
+
+  metric_query {
+    id = "elb"
+    metric {
+      namespace   = "AWS/ApplicationELB"
+      metric_name = "HTTPCode_ELB_5XX_Count"
+      dimensions  = { LoadBalancer = aws_lb.wordpress_lb.arn_suffix }
+      stat        = "Sum"
+      period      = 60
+    }
+  }
+}
+
+resource "aws_cloudwatch_dashboard" "wordpress_alb" {
+  count          = var.enable_monitoring ? 1 : 0
+  dashboard_name = "{project_name}-load-balancer"
+
+  dashboard_body = jsonencode({
+    widgets = [
+      {
+        type = "metric", x = 0, y = 0, width = 12, height = 6
+        properties = {
+          title  = "Target response time (s)"
+          region = var.aws_region
+          view   = "timeSeries"
+          metrics = [
+            for stat in ["p50", "p95", "p99"] :
+            ["AWS/ApplicationELB", "TargetResponseTime", "LoadBalancer", aws_lb.wordpress_lb.arn_suffix, { stat = stat, label = stat }]
+          ]
+        }
+      },
+      {
+        type = "metric", x = 12, y = 0, width = 12, height = 6
+        properties = {
+          title  = "Requests and 5xx"
+          region = var.aws_region
+          view   = "timeSeries"
+          stat   = "Sum"
+          metrics = [
+            ["AWS/ApplicationELB", "RequestCount", "LoadBalancer", aws_lb.wordpress_lb.arn_suffix],
+            ["AWS/ApplicationELB", "HTTPCode_Target_5XX_Count", "LoadBalancer", aws_lb.wordpress_lb.arn_suffix],
+            ["AWS/ApplicationELB", "HTTPCode_ELB_5XX_Count", "LoadBalancer", aws_lb.wordpress_lb.arn_suffix],
+          ]
+        }
+      }
+    ]
+  })
+}
+""",
+
+    "outputs": {
+        "load_balancer_dns": """
+output "load_balancer_dns" {
+  description = "DNS name of the load balancer (WordPress site URL)"
+  value       = aws_lb.wordpress_lb.dns_name
+}
+""",
+        "rds_endpoint": """
+output "rds_endpoint" {
+  description = "Address of the RDS database (empty with the local database)"
+  value       = var.use_rds ? aws_db_instance.wordpress[0].address : ""
+}
+""",
+        "instance_ip": """
+output "instance_ip" {
+  description = "Public IP of the WordPress instance"
+  value       = aws_instance.wordpress.public_ip
+}
+""",
+    },
 }
\ No newline at end of file
@@ -40,6 +40,12 @@ variable "private_subnet_cidr" {
   default     = "{private_subnet_cidr}"
 }
 
+variable "availability_zone_count" {
+  description = "Number of Availability Zones with a public subnet (multi-AZ deployments)"
+  type        = number
+  default     = {availability_zone_count}
+}
+
 variable "lb-sg-name" {
   description = "Load Balancer's security group name"
   type        = string
@@ -124,6 +130,231 @@ variable "project_name" {
 """,
 
 
+    "monitoring": """
+variable "enable_monitoring" {
+  description = "Install the CloudWatch agent and create dashboards and alarms"
+  type        = bool
+  default     = {enable_monitoring}
+}
+
+variable "alarm_email" {
+  description = "Email address subscribed to the alarms topic (empty to skip)"
+  type        = string
+  default     = "{alarm_email}"
+}
+
+variable "log_retention_days" {
+  description = "Retention of the Apache, PHP-FPM and MariaDB log groups"
+  type        = number
+  default     = {log_retention_days}
+}
+
+variable "alarm_latency_p95_ms" {
+  description = "p95 load balancer target response time alarm threshold (ms)"
+  type        = number
+  default     = {alarm_latency_p95_ms}
+}
+
+variable "alarm_latency_p99_ms" {
+  description = "p99 load balancer target response time alarm threshold (ms)"
+  type        = number
+  default     = {alarm_latency_p99_ms}
+}
+
+variable "alarm_5xx_count" {
+  description = "5xx responses per minute before alarming"
+  type        = number
+  default     = {alarm_5xx_count}
+}
+
+variable "alarm_memory_used_percent" {
+  description = "Memory used alarm threshold (%)"
+  type        = number
+  default     = {alarm_memory_used_percent}
+}
+
+variable "alarm_disk_used_percent" {
+  description = "Root volume used alarm threshold (%)"
+  type        = number
+  default     = {alarm_disk_used_percent}
+}
+""",
+
+    "web_performance": """
+variable "enable_web_performance" {
+  description = "Serve WordPress with compression, static asset cache headers, HTTP/2 and rewrite rules in the vhost"
+  type        = bool
+  default     = {enable_web_performance}
+}
+
+variable "static_asset_max_age_days" {
+  description = "Browser cache lifetime of versioned (?ver=) static assets (CSS, JS, images, fonts)"
+  type        = number
+  default     = {static_asset_max_age_days}
+}
+""",
+
+    "auto_scaling": """
+variable "enable_auto_scaling" {
+  description = "Scale the Auto Scaling group on CPU, load balancer requests and PHP-FPM queue"
+  type        = bool
+  default     = {enable_auto_scaling}
+}
+
+variable "min_instances" {
+  description = "Minimum number of WordPress instances"
+  type        = number
+  default     = {min_instances}
+}
+
+variable "max_instances" {
+  description = "Maximum number of WordPress instances"
+  type        = number
+  default     = {max_instances}
+}
+
+variable "scale_up_cpu_threshold" {
+  description = "Average CPU (%) above which an instance is added"
+  type        = number
+  default     = {scale_up_cpu_threshold}
+}
+
+variable "scale_down_cpu_threshold" {
+  description = "Average CPU (%) below which an instance is removed"
+  type        = number
+  default     = {scale_down_cpu_threshold}
+}
+
+variable "scale_requests_per_target" {
+  description = "Load balancer requests per minute and per instance kept by target tracking (0 to disable)"
+  type        = number
+  default     = {scale_requests_per_target}
+}
+
+variable "enable_warm_pool" {
+  description = "Keep stopped, pre-provisioned instances ready to join the Auto Scaling group"
+  type        = bool
+  default     = {enable_warm_pool}
+}
+
+variable "warm_pool_min_size" {
+  description = "Minimum number of instances kept in the warm pool"
+  type        = number
+  default     = {warm_pool_min_size}
+}
+
+variable "warm_pool_max_prepared_capacity" {
+  description = "Maximum running + warm instances (0 to follow max_instances)"
+  type        = number
+  default     = {warm_pool_max_prepared_capacity}
+}
+
+variable "scaling_schedules" {
+  description = "Scheduled scaling actions (cron recurrence)"
+  type = list(object({
+    name             = string
+    recurrence       = string
+    min_size         = number
+    max_size         = number
+    desired_capacity = number
+  }))
+  default = {scaling_schedules}
+}
+
+variable "scaling_schedule_time_zone" {
+  description = "IANA time zone of the scheduled scaling recurrences"
+  type        = string
+  default     = "{scaling_schedule_time_zone}"
+}
+""",
+
+    "predictive_scaling": """
+variable "enable_predictive_scaling" {
+  description = "Forecast load from CPU history and launch instances ahead of the peaks"
+  type        = bool
+  default     = {enable_predictive_scaling}
+}
+
+variable "predictive_scaling_mode" {
+  description = "ForecastOnly (observe the forecasts) or ForecastAndScale"
+  type        = string
+  default     = "{predictive_scaling_mode}"
+
+  validation {
+    condition     = contains(["ForecastOnly", "ForecastAndScale"], var.predictive_scaling_mode)
+    error_message = "predictive_scaling_mode must be ForecastOnly or ForecastAndScale."
+  }
+}
+
+variable "predictive_scaling_buffer_seconds" {
+  description = "How long before the forecast peak instances are launched"
+  type        = number
+  default     = {predictive_scaling_buffer_seconds}
+}
+
+variable "predictive_scaling_cpu_target" {
+  description = "Average CPU (%) the forecast capacity is sized for"
+  type        = number
+  default     = {predictive_scaling_cpu_target}
+}
+""",
+
+    "rds": """
+variable "use_rds" {
+  description = "Run the WordPress database on Amazon RDS (MariaDB) shared by all instances"
+  type        = bool
+  default     = {use_rds}
+}
+
+variable "rds_instance_class" {
+  description = "RDS instance class"
+  type        = string
+  default     = "{rds_instance_class}"
+}
+
+variable "rds_storage_size" {
+  description = "RDS allocated storage (GB)"
+  type        = number
+  default     = {rds_storage_size}
+}
+
+variable "rds_multi_az" {
+  description = "Keep a standby RDS replica in a second Availability Zone"
+  type        = bool
+  default     = {rds_multi_az}
+}
+""",
+
+    "efs": """
+variable "enable_efs" {
+  description = "Store wp-content/uploads on an EFS file system shared by all instances"
+  type        = bool
+  default     = {enable_efs}
+}
+
+variable "efs_throughput_mode" {
+  description = "EFS throughput mode: elastic, bursting or provisioned"
+  type        = string
+  default     = "{efs_throughput_mode}"
+
+  validation {
+    condition     = contains(["elastic", "bursting", "provisioned"], var.efs_throughput_mode)
+    error_message = "efs_throughput_mode must be elastic, bursting or provisioned."
+  }
+}
+
+variable "efs_provisioned_throughput_mibps" {
+  description = "Throughput (MiB/s) when efs_throughput_mode is provisioned"
+  type        = number
+  default     = {efs_provisioned_throughput_mibps}
+}
+
+variable "efs_attribute_cache_seconds" {
+  description = "NFS attribute cache lifetime on the instances (actimeo)"
+  type        = number
+  default     = {efs_attribute_cache_seconds}
+}
+""",
     
     # Autres groupes de variables
 }
\ No newline at end of file
@@ -1,16 +1,47 @@
 #!/bin/bash
 
 LOG_FILE="/var/log/wordpress-install.log"
+# Chaque étape terminée y laisse un marqueur: une nouvelle exécution ne rejoue
+# que les étapes manquantes et réécrit la configuration, sans toucher au site.
+STATE_DIR="/var/lib/wordpress-install"
 
 log() {
     echo "$(date '+%Y-%m-%d %H:%M:%S') - $1" | tee -a "$LOG_FILE"
 }
 
+# stage <nom> <fonction>: exécute la fonction une seule fois par instance
+stage() {
+    local name="$1"
+    shift
+    if [ -f "$STATE_DIR/$name.done" ]; then
+        log "Étape '$name' déjà effectuée, ignorée."
+        return 0
+    fi
+    if "$@"; then
+        touch "$STATE_DIR/$name.done"
+    else
+        log "ERREUR: l'étape '$name' a échoué."
+        exit 1
+    fi
+}
+
+# Littéral SQL entre apostrophes: double les apostrophes et les antislashs
+sql_string() {
+    printf '%s' "$1" | sed -e "s/\\\\/\\\\\\\\/g" -e "s/'/''/g"
+}
+
+# Identifiant SQL entre accents graves: double les accents graves
+sql_identifier() {
+    printf '%s' "$1" | sed -e 's/`/``/g'
+}
+
 if [ "$(id -u)" -ne 0 ]; then
     echo "Ce script doit être exécuté avec les privilèges sudo."
     exit 1
 fi
 
+mkdir -p "$STATE_DIR"
+
 WORDPRESS_DB_NAME="${WORDPRESS_DB_NAME}"
 WORDPRESS_DB_USER="${WORDPRESS_DB_USER}"
 WORDPRESS_DB_PASSWORD="${WORDPRESS_DB_PASSWORD}"
@@ -19,158 +50,312 @@ WORDPRESS_ADMIN_USER="${WORDPRESS_ADMIN_USER}"
 WORDPRESS_ADMIN_PASSWORD="${WORDPRESS_ADMIN_PASSWORD}"
 WORDPRESS_ADMIN_EMAIL="${WORDPRESS_ADMIN_EMAIL}"
 WORDPRESS_INSTALL_PATH="${WORDPRESS_INSTALL_PATH}"
-WORDPRESS_DOMAIN="$(curl -s https://checkip.amazonaws.com | tr -d '\n')"
-KEYS_LINE_NUM=""
+# Domaine ou DNS du load balancer; à défaut, l'IP publique de l'instance
+WORDPRESS_DOMAIN="${WORDPRESS_DOMAIN}"
+if [ -z "$WORDPRESS_DOMAIN" ]; then
+    WORDPRESS_DOMAIN="$(curl -s https://checkip.amazonaws.com | tr -d '\n')"
+fi
+WP="/usr/local/bin/wp --path=$WORDPRESS_INSTALL_PATH --allow-root"
+# Base RDS partagée si DB_HOST est fourni, sinon MariaDB sur l'instance
+DB_HOST="${DB_HOST}"
+LOCAL_DATABASE="true"
+if [ -n "$DB_HOST" ]; then
+    LOCAL_DATABASE="false"
+else
+    DB_HOST="localhost"
+fi
 
 log "Démarrage de l'installation de WordPress sur Amazon Linux 2023"
 log "Domaine/IP: $WORDPRESS_DOMAIN"
 log "Chemin d'installation: $WORDPRESS_INSTALL_PATH"
 
-log "Mise à jour des paquets système..."
-dnf update -y >> "$LOG_FILE" 2>&1
+install_packages() {
+    log "Mise à jour des paquets système..."
+    dnf update -y >> "$LOG_FILE" 2>&1
+    log "Installation d'Apache, MariaDB, PHP et autres dépendances..."
+    local db_package="mariadb105-server"
+    if [ "$LOCAL_DATABASE" != "true" ]; then
+        db_package="mariadb105"
+    fi
+    dnf install -y httpd $db_package php php-fpm php-mysqlnd php-json php-gd php-mbstring php-xml php-intl >> "$LOG_FILE" 2>&1
+}
+
+install_wp_cli() {
+    log "Installation de WP-CLI..."
+    curl -fsSL -o /usr/local/bin/wp https://raw.githubusercontent.com/wp-cli/builds/gh-pages/phar/wp-cli.phar >> "$LOG_FILE" 2>&1 || return 1
+    chmod 755 /usr/local/bin/wp
+}
 
-log "Installation d'Apache, MariaDB, PHP et autres dépendances..."
-dnf install -y httpd mariadb105-server php php-mysqlnd php-json php-gd php-mbstring php-xml php-intl expect >> "$LOG_FILE" 2>&1
+tune_services() {
+    log "Dimensionnement de MariaDB et PHP-FPM pour l'instance..."
+    if [ "$LOCAL_DATABASE" = "true" ]; then
+        cat > /etc/my.cnf.d/wordpress-tuning.cnf << EOF
+# Généré depuis le budget mémoire du type d'instance
+[mysqld]
+innodb_buffer_pool_size = ${DB_INNODB_BUFFER_POOL_MB}M
+innodb_log_file_size = ${DB_INNODB_LOG_FILE_MB}M
+innodb_flush_method = O_DIRECT
+max_connections = ${DB_MAX_CONNECTIONS}
+tmp_table_size = ${DB_TMP_TABLE_MB}M
+max_heap_table_size = ${DB_TMP_TABLE_MB}M
+performance_schema = ${DB_PERFORMANCE_SCHEMA}
+key_buffer_size = 8M
+skip_name_resolve = 1
+
+slow_query_log = 1
+slow_query_log_file = /var/log/mariadb/slow.log
+long_query_time = 1
+EOF
+    fi
 
-log "Démarrage et activation des services httpd et mariadb..."
-systemctl start httpd >> "$LOG_FILE" 2>&1
-systemctl start mariadb >> "$LOG_FILE" 2>&1
+    sed -i \
+        -e 's|^pm.max_children = .*|pm.max_children = ${PHP_FPM_MAX_CHILDREN}|' \
+        -e 's|^pm.start_servers = .*|pm.start_servers = ${PHP_FPM_START_SERVERS}|' \
+        -e 's|^pm.min_spare_servers = .*|pm.min_spare_servers = ${PHP_FPM_MIN_SPARE_SERVERS}|' \
+        -e 's|^pm.max_spare_servers = .*|pm.max_spare_servers = ${PHP_FPM_MAX_SPARE_SERVERS}|' \
+        /etc/php-fpm.d/www.conf
+}
 
-for i in {1..5}; do
-    if systemctl is-active --quiet httpd; then
-        log "Apache est démarré correctement."
-        break
+configure_apache() {
+    log "Configuration d'Apache..."
+    if [ "${ENABLE_WEB_PERFORMANCE}" = "true" ]; then
+        write_web_performance_vhost
     else
-        log "Apache n'a pas démarré. Tentative $i/5..."
-        systemctl restart httpd
-        sleep 5
+        cat > /etc/httpd/conf.d/wordpress.conf << EOF
+<VirtualHost *:80>
+    ServerAdmin webmaster@$WORDPRESS_DOMAIN
+    DocumentRoot $WORDPRESS_INSTALL_PATH
+    ServerName $WORDPRESS_DOMAIN
+
+    <Directory $WORDPRESS_INSTALL_PATH>
+        Options FollowSymLinks
+        AllowOverride All
+        Require all granted
+    </Directory>
+
+    ErrorLog /var/log/httpd/wordpress-error.log
+    CustomLog /var/log/httpd/wordpress-access.log combined
+</VirtualHost>
+EOF
     fi
-done
 
-if ! systemctl is-active --quiet httpd; then
-    log "ERREUR: Impossible de démarrer Apache après 5 tentatives."
-    exit 1
-fi
+    if [ "${ENABLE_EFS}" = "true" ]; then
+        # Les médias sont servis depuis NFS: pas de mmap ni de sendfile
+        cat > /etc/httpd/conf.d/wordpress-uploads.conf << EOF
+<Directory $WORDPRESS_INSTALL_PATH/wp-content/uploads>
+    EnableMMAP Off
+    EnableSendfile Off
+</Directory>
+EOF
+    fi
 
-systemctl enable httpd >> "$LOG_FILE" 2>&1
-systemctl enable mariadb >> "$LOG_FILE" 2>&1
+    sed -i 's/#LoadModule rewrite_module modules\/mod_rewrite.so/LoadModule rewrite_module modules\/mod_rewrite.so/' /etc/httpd/conf.modules.d/00-base.conf
+}
 
-log "Sécurisation de l'installation MariaDB..."
+# Profil web-performance: compression, en-têtes de cache des ressources statiques,
+# HTTP/2 et règles de réécriture dans le vhost (AllowOverride None, donc aucune
+# recherche de .htaccess à chaque requête).
+write_web_performance_vhost() {
+    # Médias envoyés et fichiers de thème sans version peuvent changer sous la même URL
+    local unversioned_max_age=3600
+    cat > /etc/httpd/conf.d/wordpress.conf << EOF
+<IfModule http2_module>
+    Protocols h2 h2c http/1.1
+</IfModule>
 
-expect << EOF
-spawn mysql_secure_installation
+<VirtualHost *:80>
+    ServerAdmin webmaster@$WORDPRESS_DOMAIN
+    DocumentRoot $WORDPRESS_INSTALL_PATH
+    ServerName $WORDPRESS_DOMAIN
 
-expect "Enter current password for root (enter for none):"
-send "\r"
+    <Directory $WORDPRESS_INSTALL_PATH>
+        Options FollowSymLinks
+        AllowOverride None
+        Require all granted
 
-expect "Switch to unix_socket authentication"
-send "n\r"
+        RewriteEngine On
+        RewriteBase /
+        RewriteRule ^index\.php$ - [L]
+        RewriteCond %%{REQUEST_FILENAME} !-f
+        RewriteCond %%{REQUEST_FILENAME} !-d
+        RewriteRule . /index.php [L]
+    </Directory>
 
-expect "Change the root password?"
-send "y\r"
+    <IfModule mod_brotli.c>
+        AddOutputFilterByType BROTLI_COMPRESS;DEFLATE text/html text/plain text/css text/xml text/javascript application/javascript application/json application/xml application/rss+xml image/svg+xml font/ttf
+    </IfModule>
+    <IfModule !mod_brotli.c>
+        AddOutputFilterByType DEFLATE text/html text/plain text/css text/xml text/javascript application/javascript application/json application/xml application/rss+xml image/svg+xml font/ttf
+    </IfModule>
+
+    # Seules les ressources versionnées par WordPress (?ver=) changent d'URL à chaque
+    # mise à jour: cache long et immutable pour elles, cache court pour le reste
+    <FilesMatch "\.(css|js|mjs|png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|otf|eot)$">
+        ExpiresActive On
+        ExpiresDefault "access plus $unversioned_max_age seconds"
+        Header set Cache-Control "public, max-age=$unversioned_max_age"
+        <If "%%{QUERY_STRING} =~ /(^|&)ver=/">
+            Header unset Expires
+            Header set Cache-Control "public, max-age=${STATIC_ASSET_MAX_AGE}, immutable"
+        </If>
+    </FilesMatch>
 
-expect "New password:"
-send "$WORDPRESS_DB_PASSWORD\r"
+    ErrorLog /var/log/httpd/wordpress-error.log
+    CustomLog /var/log/httpd/wordpress-access.log combined
+</VirtualHost>
+EOF
+}
 
-expect "Re-enter new password:"
-send "$WORDPRESS_DB_PASSWORD\r"
+configure_monitoring() {
+    log "Activation des pages de statut Apache et PHP-FPM (localhost uniquement)..."
+    sed -i 's|^;\?pm.status_path = .*|pm.status_path = /fpm-status|' /etc/php-fpm.d/www.conf
+    cat > /etc/httpd/conf.d/status.conf << 'EOF'
+Listen 127.0.0.1:8081
+ExtendedStatus On
+<VirtualHost 127.0.0.1:8081>
+    <Location "/server-status">
+        SetHandler server-status
+        Require local
+    </Location>
+    <Location "/fpm-status">
+        SetHandler "proxy:unix:/run/php-fpm/www.sock|fcgi://localhost"
+        Require local
+    </Location>
+</VirtualHost>
+EOF
 
-expect "Remove anonymous users?"
-send "y\r"
+    cat > /usr/local/bin/wordpress-status-metrics.sh << 'EOF'
+#!/bin/bash
+# Push Apache and PHP-FPM status gauges to the CloudWatch agent statsd listener
+gauge() {
+    [ -n "$2" ] && echo "$1:$2|g" > /dev/udp/127.0.0.1/8125
+}
+APACHE=$(curl -s --max-time 5 "http://127.0.0.1:8081/server-status?auto")
+gauge apache_busy_workers "$(echo "$APACHE" | awk -F': ' '/^BusyWorkers/ {print $2}')"
+gauge apache_idle_workers "$(echo "$APACHE" | awk -F': ' '/^IdleWorkers/ {print $2}')"
+gauge apache_requests_per_sec "$(echo "$APACHE" | awk -F': ' '/^ReqPerSec/ {print $2}')"
+FPM=$(curl -s --max-time 5 "http://127.0.0.1:8081/fpm-status")
+gauge php_fpm_active_processes "$(echo "$FPM" | awk -F': +' '/^active processes/ {print $2}')"
+gauge php_fpm_idle_processes "$(echo "$FPM" | awk -F': +' '/^idle processes/ {print $2}')"
+gauge php_fpm_listen_queue "$(echo "$FPM" | awk -F': +' '/^listen queue:/ {print $2}')"
+gauge php_fpm_max_children_reached "$(echo "$FPM" | awk -F': +' '/^max children reached/ {print $2}')"
+EOF
+    chmod 755 /usr/local/bin/wordpress-status-metrics.sh
 
-expect "Disallow root login remotely?"
-send "y\r"
+    cat > /etc/systemd/system/wordpress-status-metrics.service << 'EOF'
+[Unit]
+Description=Push Apache and PHP-FPM status metrics to the CloudWatch agent
 
-expect "Remove test database and access to it?"
-send "y\r"
+[Service]
+Type=oneshot
+ExecStart=/usr/local/bin/wordpress-status-metrics.sh
+EOF
+    cat > /etc/systemd/system/wordpress-status-metrics.timer << 'EOF'
+[Unit]
+Description=Push Apache and PHP-FPM status metrics every 30 seconds
 
-expect "Reload privilege tables now?"
-send "y\r"
+[Timer]
+OnBootSec=60
+OnUnitActiveSec=30
+AccuracySec=1
 
-expect eof
+[Install]
+WantedBy=timers.target
 EOF
+    systemctl daemon-reload
+}
+
+start_services() {
+    log "Démarrage et activation des services httpd, php-fpm et mariadb..."
+    if [ "$LOCAL_DATABASE" = "true" ]; then
+        systemctl enable mariadb >> "$LOG_FILE" 2>&1
+        systemctl restart mariadb >> "$LOG_FILE" 2>&1
+    fi
+    systemctl enable php-fpm httpd >> "$LOG_FILE" 2>&1
+    systemctl restart php-fpm >> "$LOG_FILE" 2>&1
+
+    for i in {1..5}; do
+        if systemctl restart httpd >> "$LOG_FILE" 2>&1 && systemctl is-active --quiet httpd; then
+            log "Apache est démarré correctement."
+            return 0
+        fi
+        log "Apache n'a pas démarré. Tentative $i/5..."
+        sleep 5
+    done
 
-log "Création de la base de données WordPress..."
-mysql -u root -p"$WORDPRESS_DB_PASSWORD" -e "CREATE DATABASE IF NOT EXISTS $WORDPRESS_DB_NAME DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
+    log "ERREUR: Impossible de démarrer Apache après 5 tentatives."
+    exit 1
+}
 
-log "Création de l'utilisateur pour WordPress..."
-mysql -u root -p"$WORDPRESS_DB_PASSWORD" <<EOF
-CREATE USER IF NOT EXISTS '$WORDPRESS_DB_USER'@'localhost' IDENTIFIED BY '$WORDPRESS_DB_PASSWORD';
-GRANT ALL PRIVILEGES ON $WORDPRESS_DB_NAME.* TO '$WORDPRESS_DB_USER'@'localhost';
+# Équivalent de mysql_secure_installation en SQL direct. root garde l'accès par
+# socket unix: une nouvelle exécution n'a pas besoin de son mot de passe.
+secure_database() {
+    local db_password
+    db_password=$(sql_string "$WORDPRESS_DB_PASSWORD")
+    log "Sécurisation de l'installation MariaDB..."
+    mysql -u root << EOF
+ALTER USER 'root'@'localhost' IDENTIFIED VIA unix_socket OR mysql_native_password USING PASSWORD('$db_password');
+DELETE FROM mysql.global_priv WHERE User = '';
+DELETE FROM mysql.global_priv WHERE User = 'root' AND Host NOT IN ('localhost', '127.0.0.1', '::1');
+DROP DATABASE IF EXISTS test;
+DELETE FROM mysql.db WHERE Db = 'test' OR Db = 'test\\_%';
 FLUSH PRIVILEGES;
 EOF
+}
 
-log "Préparation du répertoire web..."
-mkdir -p $WORDPRESS_INSTALL_PATH
-rm -rf $WORDPRESS_INSTALL_PATH/*
-
-log "Téléchargement et extraction de WordPress..."
-cd /tmp
-curl -O https://wordpress.org/latest.tar.gz >> "$LOG_FILE" 2>&1
-tar -xzf latest.tar.gz >> "$LOG_FILE" 2>&1
-cp -rf wordpress/* $WORDPRESS_INSTALL_PATH/ >> "$LOG_FILE" 2>&1
-rm -rf wordpress latest.tar.gz
-
-log "Création du fichier de configuration WordPress..."
-cp $WORDPRESS_INSTALL_PATH/wp-config-sample.php $WORDPRESS_INSTALL_PATH/wp-config.php
-sed -i "s|database_name_here|$WORDPRESS_DB_NAME|g" $WORDPRESS_INSTALL_PATH/wp-config.php
-sed -i "s|username_here|$WORDPRESS_DB_USER|g" $WORDPRESS_INSTALL_PATH/wp-config.php
-sed -i "s|password_here|$WORDPRESS_DB_PASSWORD|g" $WORDPRESS_INSTALL_PATH/wp-config.php
-sed -i "s|localhost|localhost|g" $WORDPRESS_INSTALL_PATH/wp-config.php
-log ""
-
-log "Génération des clés de sécurité WordPress..."
-KEYS=$(curl -s https://api.wordpress.org/secret-key/1.1/salt/)
-KEYS_LINE_NUM=$(grep -n "define('AUTH_KEY'" $WORDPRESS_INSTALL_PATH/wp-config.php | cut -d: -f1)
-NONCE_SALT_LINE_NUM=$(grep -n "define('NONCE_SALT'" $WORDPRESS_INSTALL_PATH/wp-config.php | cut -d: -f1)
-if [ -n "$KEYS_LINE_NUM" ] && [ -n "$NONCE_SALT_LINE_NUM" ]; then
-    sed -i "${KEYS_LINE_NUM},${NONCE_SALT_LINE_NUM}d" $WORDPRESS_INSTALL_PATH/wp-config.php
-    sed -i "${KEYS_LINE_NUM}i\\${KEYS}" $WORDPRESS_INSTALL_PATH/wp-config.php
-fi
+create_database() {
+    local db_name db_user db_password
+    db_name=$(sql_identifier "$WORDPRESS_DB_NAME")
+    db_user=$(sql_string "$WORDPRESS_DB_USER")
+    db_password=$(sql_string "$WORDPRESS_DB_PASSWORD")
+    log "Création de la base de données et de l'utilisateur WordPress..."
+    mysql -u root << EOF
+CREATE DATABASE IF NOT EXISTS \`$db_name\` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+CREATE USER IF NOT EXISTS '$db_user'@'localhost' IDENTIFIED BY '$db_password';
+GRANT ALL PRIVILEGES ON \`$db_name\`.* TO '$db_user'@'localhost';
+FLUSH PRIVILEGES;
+EOF
+}
 
-log "Installation de WP-CLI..."
-cd /tmp
-curl -O https://raw.githubusercontent.com/wp-cli/builds/gh-pages/phar/wp-cli.phar >> "$LOG_FILE" 2>&1
-chmod +x wp-cli.phar
-
-log "Installation de WordPress avec WP-CLI..."
-php /tmp/wp-cli.phar core install --url="http://$WORDPRESS_DOMAIN" \
-                                  --title="$WORDPRESS_SITE_TITLE" \
-                                  --admin_user="$WORDPRESS_ADMIN_USER" \
-                                  --admin_password="$WORDPRESS_ADMIN_PASSWORD" \
-                                  --admin_email="$WORDPRESS_ADMIN_EMAIL" \
-                                  --path="$WORDPRESS_INSTALL_PATH" \
-                                  --allow-root >> "$LOG_FILE" 2>&1
-
-log "Configuration des permissions..."
-chown -R apache:apache $WORDPRESS_INSTALL_PATH
-find $WORDPRESS_INSTALL_PATH -type d -exec chmod 750 {} \;
-find $WORDPRESS_INSTALL_PATH -type f -exec chmod 640 {} \;
-chmod 400 $WORDPRESS_INSTALL_PATH/wp-config.php
-
-log "Configuration d'Apache..."
-cat > /etc/httpd/conf.d/wordpress.conf << EOF
-<VirtualHost *:80>
-    ServerAdmin webmaster@$WORDPRESS_DOMAIN
-    DocumentRoot $WORDPRESS_INSTALL_PATH
-    ServerName $WORDPRESS_DOMAIN
+# Chaque sous-étape vérifie l'état existant: les fichiers déjà présents (thèmes,
+# extensions, médias) ne sont jamais supprimés.
+install_wordpress() {
+    mkdir -p "$WORDPRESS_INSTALL_PATH"
 
-    <Directory $WORDPRESS_INSTALL_PATH>
-        Options FollowSymLinks
-        AllowOverride All
-        Require all granted
-    </Directory>
+    if [ ! -f "$WORDPRESS_INSTALL_PATH/wp-includes/version.php" ]; then
+        log "Téléchargement et extraction de WordPress..."
+        curl -fsSL https://wordpress.org/latest.tar.gz | tar -xz -C "$WORDPRESS_INSTALL_PATH" --strip-components=1 || return 1
+    fi
 
-    ErrorLog /var/log/httpd/wordpress-error.log
-    CustomLog /var/log/httpd/wordpress-access.log combined
-</VirtualHost>
-EOF
+    if [ ! -f "$WORDPRESS_INSTALL_PATH/wp-config.php" ]; then
+        log "Création du fichier de configuration WordPress et des clés de sécurité..."
+        # Base partagée: sans clés dans wp-config.php, WordPress les génère une fois
+        # dans la base, et toutes les instances acceptent les mêmes cookies de session
+        local salts=""
+        if [ "$LOCAL_DATABASE" != "true" ]; then
+            salts="--skip-salts"
+        fi
+        $WP config create --dbname="$WORDPRESS_DB_NAME" \
+                          --dbuser="$WORDPRESS_DB_USER" \
+                          --dbpass="$WORDPRESS_DB_PASSWORD" \
+                          --dbhost="$DB_HOST" \
+                          $salts \
+                          --skip-check >> "$LOG_FILE" 2>&1 || return 1
+    fi
 
-log "Activation du module rewrite..."
-sed -i 's/#LoadModule rewrite_module modules\/mod_rewrite.so/LoadModule rewrite_module modules\/mod_rewrite.so/' /etc/httpd/conf.modules.d/00-base.conf
+    if ! $WP core is-installed >> "$LOG_FILE" 2>&1; then
+        log "Installation de WordPress avec WP-CLI..."
+        $WP core install --url="http://$WORDPRESS_DOMAIN" \
+                         --title="$WORDPRESS_SITE_TITLE" \
+                         --admin_user="$WORDPRESS_ADMIN_USER" \
+                         --admin_password="$WORDPRESS_ADMIN_PASSWORD" \
+                         --admin_email="$WORDPRESS_ADMIN_EMAIL" >> "$LOG_FILE" 2>&1 || return 1
+    fi
 
-log "Création du fichier .htaccess..."
-cat > $WORDPRESS_INSTALL_PATH/.htaccess << EOF
+    # Le vhost web-performance porte les réécritures et ignore .htaccess (AllowOverride None)
+    if [ "${ENABLE_WEB_PERFORMANCE}" != "true" ] && [ ! -f "$WORDPRESS_INSTALL_PATH/.htaccess" ]; then
+        log "Création du fichier .htaccess..."
+        cat > $WORDPRESS_INSTALL_PATH/.htaccess << EOF
 # BEGIN WordPress
 <IfModule mod_rewrite.c>
 RewriteEngine On
@@ -182,24 +367,175 @@ RewriteRule . /index.php [L]
 </IfModule>
 # END WordPress
 EOF
+    fi
+}
+
+set_permissions() {
+    log "Configuration des permissions..."
+    chown -R apache:apache "$WORDPRESS_INSTALL_PATH"
+    find "$WORDPRESS_INSTALL_PATH" -type d -exec chmod 750 {} +
+    find "$WORDPRESS_INSTALL_PATH" -type f -exec chmod 640 {} +
+    if [ -f "$WORDPRESS_INSTALL_PATH/.htaccess" ]; then
+        chmod 644 "$WORDPRESS_INSTALL_PATH/.htaccess"
+    fi
+    chmod 400 "$WORDPRESS_INSTALL_PATH/wp-config.php"
+}
+
+# Les médias (wp-content/uploads) sont partagés entre les instances via EFS. Le code
+# PHP reste sur le volume local: seuls les fichiers envoyés passent par le réseau.
+mount_shared_uploads() {
+    local uploads="$WORDPRESS_INSTALL_PATH/wp-content/uploads"
+    local options="_netdev,noresvport,tls,actimeo=${EFS_ATTRIBUTE_CACHE_SECONDS}"
+
+    log "Montage du système de fichiers EFS ${EFS_FILE_SYSTEM_ID} pour les médias..."
+    dnf install -y amazon-efs-utils >> "$LOG_FILE" 2>&1 || return 1
+
+    # Cache local des fichiers lus (FS-Cache) quand cachefilesd est disponible
+    if dnf install -y cachefilesd >> "$LOG_FILE" 2>&1 && systemctl enable --now cachefilesd >> "$LOG_FILE" 2>&1; then
+        options="$options,fsc"
+    fi
+
+    mkdir -p "$uploads" /mnt/efs-uploads
+    for i in {1..10}; do
+        if mount -t efs -o "$options" "${EFS_FILE_SYSTEM_ID}:/" /mnt/efs-uploads >> "$LOG_FILE" 2>&1; then
+            break
+        fi
+        log "EFS pas encore joignable. Tentative $i/10..."
+        sleep 15
+    done
+    mountpoint -q /mnt/efs-uploads || return 1
+
+    # Les médias déjà présents sur le volume local sont copiés sans écraser ceux du partage
+    cp -an "$uploads/." /mnt/efs-uploads/
+    chown apache:apache /mnt/efs-uploads
+    umount /mnt/efs-uploads
+
+    if ! grep -q "^${EFS_FILE_SYSTEM_ID}:/ " /etc/fstab; then
+        echo "${EFS_FILE_SYSTEM_ID}:/ $uploads efs $options 0 0" >> /etc/fstab
+    fi
+    mount "$uploads" >> "$LOG_FILE" 2>&1
+}
+
+configure_firewall() {
+    if systemctl is-active --quiet firewalld; then
+        log "Configuration du pare-feu..."
+        firewall-cmd --permanent --add-service=http >> "$LOG_FILE" 2>&1
+        firewall-cmd --permanent --add-service=https >> "$LOG_FILE" 2>&1
+        firewall-cmd --reload >> "$LOG_FILE" 2>&1
+    fi
+}
+
+create_info_page() {
+    log "Création d'un fichier de test PHP..."
+    echo "<?php phpinfo();" > $WORDPRESS_INSTALL_PATH/info.php
+    chown apache:apache $WORDPRESS_INSTALL_PATH/info.php
+    chmod 644 $WORDPRESS_INSTALL_PATH/info.php
+}
+
+install_http2() {
+    log "Installation du module HTTP/2 d'Apache..."
+    dnf install -y mod_http2 >> "$LOG_FILE" 2>&1
+}
+
+install_cloudwatch_agent() {
+    log "Installation de l'agent CloudWatch..."
+    dnf install -y amazon-cloudwatch-agent >> "$LOG_FILE" 2>&1
+}
+
+# À chaque démarrage (instance arrêtée puis relancée, instance du warm pool) le
+# script est rejoué (étapes déjà faites ignorées) pour réécrire la configuration
+# (IP publique, vhost) et, le cas échéant, valider le hook de cycle de vie.
+install_boot_service() {
+    if [ "$0" != "/usr/local/sbin/wordpress-install.sh" ]; then
+        install -m 700 "$0" /usr/local/sbin/wordpress-install.sh
+    fi
+    cat > /etc/systemd/system/wordpress-install.service << 'EOF'
+[Unit]
+Description=Re-apply the WordPress instance configuration at boot
+After=network-online.target
+Wants=network-online.target
+ConditionPathExists=/var/lib/wordpress-install/packages.done
+
+[Service]
+Type=oneshot
+ExecStart=/usr/local/sbin/wordpress-install.sh
+
+[Install]
+WantedBy=multi-user.target
+EOF
+    systemctl daemon-reload
+    systemctl enable wordpress-install.service >> "$LOG_FILE" 2>&1
+}
+
+update_site_url() {
+    # L'IP publique change à chaque redémarrage: l'URL est réécrite à chaque exécution
+    log "Mise à jour de l'URL du site: http://$WORDPRESS_DOMAIN"
+    $WP option update home "http://$WORDPRESS_DOMAIN" >> "$LOG_FILE" 2>&1
+    $WP option update siteurl "http://$WORDPRESS_DOMAIN" >> "$LOG_FILE" 2>&1
+}
+
+complete_lifecycle_action() {
+    local token instance_id output
+    token=$(curl -s -X PUT "http://169.254.169.254/latest/api/token" -H "X-aws-ec2-metadata-token-ttl-seconds: 60")
+    instance_id=$(curl -s -H "X-aws-ec2-metadata-token: $token" http://169.254.169.254/latest/meta-data/instance-id)
+
+    log "Validation du hook de cycle de vie ${LIFECYCLE_HOOK_NAME}..."
+    if output=$(aws autoscaling complete-lifecycle-action \
+        --lifecycle-hook-name "${LIFECYCLE_HOOK_NAME}" \
+        --auto-scaling-group-name "${AUTO_SCALING_GROUP_NAME}" \
+        --lifecycle-action-result CONTINUE \
+        --instance-id "$instance_id" \
+        --region "${AWS_REGION}" 2>&1); then
+        log "Hook de cycle de vie validé."
+    else
+        # Sans validation, le hook expire et l'instance est abandonnée (default_result = ABANDON)
+        log "ERREUR: complete-lifecycle-action a échoué: $output"
+        return 1
+    fi
+}
 
-chown apache:apache $WORDPRESS_INSTALL_PATH/.htaccess
-chmod 644 $WORDPRESS_INSTALL_PATH/.htaccess
+# Étapes lourdes ou destructrices: une seule fois par instance
+stage packages install_packages
+stage wp-cli install_wp_cli
+if [ "${ENABLE_WEB_PERFORMANCE}" = "true" ]; then
+    stage http2 install_http2
+fi
+if [ "${ENABLE_MONITORING}" = "true" ]; then
+    stage cloudwatch-agent install_cloudwatch_agent
+fi
 
-log "Redémarrage d'Apache..."
-systemctl restart httpd >> "$LOG_FILE" 2>&1
+# Configuration: réécrite à chaque exécution, rapide et idempotente
+tune_services
+configure_apache
+if [ "${ENABLE_MONITORING}" = "true" ]; then
+    configure_monitoring
+fi
+start_services
 
-if systemctl is-active --quiet firewalld; then
-    log "Configuration du pare-feu..."
-    firewall-cmd --permanent --add-service=http >> "$LOG_FILE" 2>&1
-    firewall-cmd --permanent --add-service=https >> "$LOG_FILE" 2>&1
-    firewall-cmd --reload >> "$LOG_FILE" 2>&1
+if [ "$LOCAL_DATABASE" = "true" ]; then
+    stage secure-database secure_database
+    stage database create_database
+fi
+stage wordpress install_wordpress
+update_site_url
+stage permissions set_permissions
+if [ "${ENABLE_EFS}" = "true" ]; then
+    stage efs-uploads mount_shared_uploads
+fi
+stage firewall configure_firewall
+stage info-page create_info_page
+stage boot-service install_boot_service
+
+if [ "${ENABLE_MONITORING}" = "true" ]; then
+    log "Démarrage de l'agent CloudWatch et des métriques statsd..."
+    systemctl enable --now wordpress-status-metrics.timer >> "$LOG_FILE" 2>&1
+    /opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl -a fetch-config -m ec2 -s \
+        -c "ssm:${CLOUDWATCH_AGENT_CONFIG_PARAMETER}" >> "$LOG_FILE" 2>&1
 fi
 
-log "Création d'un fichier de test PHP..."
-echo "<?php phpinfo();" > $WORDPRESS_INSTALL_PATH/info.php
-chown apache:apache $WORDPRESS_INSTALL_PATH/info.php
-chmod 644 $WORDPRESS_INSTALL_PATH/info.php
+if [ -n "${LIFECYCLE_HOOK_NAME}" ]; then
+    complete_lifecycle_action
+fi
 
 echo "==================================================="
 echo "Installation de WordPress terminée !"
@@ -223,4 +559,4 @@ log "Mot de passe admin: $WORDPRESS_ADMIN_PASSWORD"
 log "Nom de la base de données: $WORDPRESS_DB_NAME"
 log "Utilisateur de la base de données: $WORDPRESS_DB_USER"
 log "Mot de passe de la base de données: $WORDPRESS_DB_PASSWORD"
-log "Installation terminée avec succès!"
\ No newline at end of file
+log "Installation terminée avec succès!"